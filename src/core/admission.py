@@ -0,0 +1,196 @@
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, abort, g, request
+from prometheus_client import Counter, Gauge
+
+from core.settings import settings
+from core.logging import get_logger
+
+logger = get_logger("admission")
+
+ADMISSION_LIMIT = Gauge("admission_concurrency_limit", "Limite adaptativo de requisições simultâneas ao banco")
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "Requisições dependentes do banco em andamento")
+ADMISSION_SHED = Counter("admission_shed_total", "Requisições rejeitadas pelo controle de admissão", ["priority"])
+
+# Prioridades: escritas usam todo o limite; listagens anônimas só uma fração dele
+WRITE = "write"
+READ = "read"
+LIST = "list"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Endpoints que não tocam o banco e nunca são rejeitados
+NON_DB_ENDPOINTS = {"static", "pages.new_event_page", "prometheus_metrics"}
+
+# Listagens e buscas anônimas, as primeiras a serem descartadas sob pressão
+LIST_ENDPOINTS = {"api.read_events", "api.read_facets", "pages.list_events_page", "pages.events_calendar"}
+
+
+def classify(method: str, endpoint: Optional[str]) -> Optional[str]:
+    """
+    Define a prioridade da requisição para o controle de admissão
+
+    Returns:
+        WRITE, READ ou LIST; None para requisições que não usam o banco
+    """
+    if endpoint is None or endpoint in NON_DB_ENDPOINTS:
+        return None
+    if method in WRITE_METHODS:
+        return WRITE
+    if endpoint in LIST_ENDPOINTS:
+        return LIST
+    return READ
+
+
+class AdmissionController:
+    """
+    Limite de concorrência AIMD guiado pela latência observada
+
+    A cada requisição concluída a latência entra numa média móvel (EWMA). Se a
+    média passa da latência alvo, o limite é reduzido multiplicativamente (no
+    máximo uma vez por "RTT"); enquanto a latência está saudável e o limite está
+    sendo usado, ele cresce ~1 a cada `limit` requisições concluídas.
+
+    Listagens só ficam restritas a `list_share` do limite depois de uma redução
+    (banco sob pressão), até o limite voltar ao máximo; com latência saudável
+    todas as vagas atendem qualquer requisição.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: float = 2,
+        max_limit: float = 100,
+        target_latency: float = 0.5,
+        list_share: float = 0.75,
+        backoff: float = 0.9,
+        smoothing: float = 0.2,
+        clock=time.monotonic,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.target_latency = target_latency
+        self.list_share = list_share
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.clock = clock
+
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.last_decrease = 0.0
+        self.reserve_writes = False
+        self.lock = threading.Lock()
+
+        ADMISSION_LIMIT.set(self.limit)
+
+    def _capacity(self, priority: str) -> float:
+        if priority == LIST and self.reserve_writes:
+            return max(1.0, self.limit * self.list_share)
+        return self.limit
+
+    def try_acquire(self, priority: str) -> bool:
+        """Reserva uma vaga para a requisição; False se ela deve ser rejeitada"""
+        with self.lock:
+            if self.in_flight >= self._capacity(priority):
+                ADMISSION_SHED.labels(priority=priority).inc()
+                return False
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self.in_flight)
+            return True
+
+    def release(self, latency: float, overloaded: bool = False):
+        """
+        Libera a vaga e ajusta o limite
+
+        Args:
+            latency: Duração da requisição em segundos
+            overloaded: Se a requisição falhou por sobrecarga (ex.: timeout de consulta)
+        """
+        with self.lock:
+            in_flight = self.in_flight
+            self.in_flight = max(0, self.in_flight - 1)
+            ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma += self.smoothing * (latency - self.latency_ewma)
+
+            now = self.clock()
+            if overloaded or self.latency_ewma > self.target_latency:
+                if now - self.last_decrease >= self.latency_ewma:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.last_decrease = now
+                    self.reserve_writes = True
+                    logger.debug(f"Limite de admissão reduzido para {self.limit:.1f}")
+            elif in_flight * 2 >= self.limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                if self.limit >= self.max_limit:
+                    self.reserve_writes = False
+
+            ADMISSION_LIMIT.set(self.limit)
+
+
+def default_limits(threads: int) -> tuple:
+    """
+    Limites (inicial, mínimo, máximo) do controle de admissão de um worker
+
+    Um worker nunca tem mais requisições em andamento do que threads, então
+    limites acima disso nunca rejeitariam nada (e o limite não cresceria).
+    Valores configurados explicitamente têm precedência.
+    """
+    max_limit = settings.ADMISSION_MAX_LIMIT or threads
+    initial_limit = min(settings.ADMISSION_INITIAL_LIMIT or threads, max_limit)
+    min_limit = min(settings.ADMISSION_MIN_LIMIT, initial_limit)
+    return initial_limit, min_limit, max_limit
+
+
+_initial_limit, _min_limit, _max_limit = default_limits(settings.WORKER_THREADS)
+
+controller = AdmissionController(
+    initial_limit=_initial_limit,
+    min_limit=_min_limit,
+    max_limit=_max_limit,
+    target_latency=settings.ADMISSION_TARGET_LATENCY_MS / 1000,
+    list_share=settings.ADMISSION_LIST_SHARE,
+)
+
+
+def init_app(app: Flask, admission: AdmissionController = controller, retry_after: int = settings.ADMISSION_RETRY_AFTER):
+    """
+    Registra o controle de admissão nos hooks de requisição da aplicação
+
+    Args:
+        app: Aplicação Flask
+        admission: Controlador usado (um por processo)
+        retry_after: Valor do cabeçalho Retry-After nas rejeições, em segundos
+    """
+
+    @app.before_request
+    def admission_before_request():
+        # Rejeita cedo quando o banco está saturado
+        priority = classify(request.method, request.endpoint)
+        if not priority:
+            return
+        if not admission.try_acquire(priority):
+            logger.warning(f"Requisição rejeitada por sobrecarga: {request.method} {request.path} ({priority})")
+            abort(503, description="Servidor sobrecarregado, tente novamente em instantes",
+                  retry_after=retry_after)
+        g.admission_started = time.monotonic()
+
+    @app.after_request
+    def admission_after_request(response):
+        # 503 vindo da aplicação (ex.: timeout de consulta) também indica sobrecarga
+        g.admission_overloaded = response.status_code == 503
+        return response
+
+    @app.teardown_request
+    def admission_teardown_request(exc):
+        # Executado mesmo quando a view levanta exceção: a vaga sempre é liberada
+        started = g.pop("admission_started", None)
+        if started is not None:
+            admission.release(time.monotonic() - started,
+                              overloaded=g.pop("admission_overloaded", False))
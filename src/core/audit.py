@@ -0,0 +1,306 @@
+import atexit
+import datetime
+import glob
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from core.logging import get_logger
+from models.audit import EventAudit
+
+logger = get_logger("audit")
+
+AUDIT_QUEUE_DEPTH = Gauge("audit_queue_depth", "Eventos de negócio aguardando gravação em event_audit")
+AUDIT_FLUSH_SECONDS = Histogram("audit_flush_seconds", "Duração da gravação de um lote em event_audit")
+AUDIT_WRITTEN = Counter("audit_events_written_total", "Eventos de negócio gravados em event_audit")
+AUDIT_SPILLED = Counter("audit_events_spilled_total", "Eventos de negócio enviados para o arquivo de transbordo")
+AUDIT_DROPPED = Counter("audit_events_dropped_total", "Eventos de negócio descartados", ["reason"])
+
+
+class AuditSink:
+    """
+    Trilha de auditoria write-behind
+
+    log_business_event apenas enfileira o evento (fila limitada, sem I/O na
+    requisição); uma thread em background grava lotes em event_audit. Com a
+    fila cheia ou o banco indisponível, os eventos vão para um arquivo JSONL de
+    transbordo (ou são descartados se ele não estiver configurado), que é
+    reprocessado quando a thread inicia e sempre que a fila esvazia.
+
+    Cada processo escreve no próprio arquivo (`<spill_path>.<pid>`): nenhum
+    processo renomeia um arquivo em que outro ainda está escrevendo. Arquivos
+    de processos que já terminaram são assumidos por quem reprocessar primeiro.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        spill_path: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path or None
+        self.host = socket.gethostname()
+
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self.spill_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        # A thread é criada no processo que usa o sink (seguro com fork/--preload)
+        if self.pid == os.getpid() and self.thread and self.thread.is_alive():
+            return
+        with self.start_lock:
+            if self.pid == os.getpid() and self.thread and self.thread.is_alive():
+                return
+            self.pid = os.getpid()
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+            self.thread.start()
+
+    def record(self, event: str, source: str, details: dict):
+        """Enfileira um evento de negócio; nunca bloqueia a requisição"""
+        row = {
+            "occurred_at": datetime.datetime.utcnow(),
+            "event": event,
+            "source": source,
+            "host": self.host,
+            "details": json.dumps(details, default=str, ensure_ascii=False),
+        }
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            self._spill([row], reason="queue_full")
+        AUDIT_QUEUE_DEPTH.set(self.queue.qsize())
+
+    def _drain(self, timeout: Optional[float]) -> List[Dict]:
+        batch = []
+        try:
+            batch.append(self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: List[Dict]) -> bool:
+        start = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(EventAudit), batch)
+        except Exception as e:
+            logger.error(f"Erro ao gravar {len(batch)} evento(s) de auditoria: {str(e)}")
+            return False
+        AUDIT_FLUSH_SECONDS.observe(time.perf_counter() - start)
+        AUDIT_WRITTEN.inc(len(batch))
+        return True
+
+    def _spill(self, rows: List[Dict], reason: str) -> bool:
+        if not self.spill_path:
+            AUDIT_DROPPED.labels(reason=reason).inc(len(rows))
+            return False
+        try:
+            with self.spill_lock, open(self._spill_file(os.getpid()), "a", encoding="utf-8") as spill:
+                for row in rows:
+                    spill.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+            AUDIT_SPILLED.inc(len(rows))
+            return True
+        except OSError as e:
+            logger.error(f"Erro ao gravar transbordo de auditoria: {str(e)}")
+            AUDIT_DROPPED.labels(reason="spill_failed").inc(len(rows))
+            return False
+
+    def _quarantine(self, line: str):
+        # Linhas ilegíveis (ex.: worker morto no meio da escrita) ficam em .bad para inspeção
+        AUDIT_DROPPED.labels(reason="corrupt").inc()
+        try:
+            with open(f"{self.spill_path}.bad", "a", encoding="utf-8") as bad:
+                bad.write(line if line.endswith("\n") else line + "\n")
+        except OSError as e:
+            logger.error(f"Erro ao gravar linha de auditoria corrompida: {str(e)}")
+
+    @staticmethod
+    def _parse_spilled(line: str) -> Optional[Dict]:
+        try:
+            row = json.loads(line)
+            row["occurred_at"] = datetime.datetime.fromisoformat(row["occurred_at"])
+            return {key: row[key] for key in ("occurred_at", "event", "source", "host", "details")}
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _spill_file(self, pid: int) -> str:
+        return f"{self.spill_path}.{pid}"
+
+    def _replay_path(self, pid: int) -> str:
+        return f"{self.spill_path}.{pid}.replay"
+
+    def _orphaned_files(self) -> List[str]:
+        """Transbordos e .replay de processos que já terminaram (e o .replay deste, se sobrou)"""
+        orphans = []
+        prefix = f"{self.spill_path}."
+        for path in glob.glob(f"{glob.escape(self.spill_path)}.*"):
+            suffix = path[len(prefix):]
+            pid_text = suffix[:-len(".replay")] if suffix.endswith(".replay") else suffix
+            if not pid_text.isdigit():
+                continue  # .bad e outros arquivos
+            pid = int(pid_text)
+            if pid == os.getpid():
+                if path == self._replay_path(pid):
+                    orphans.append(path)
+                continue  # o transbordo próprio é tratado em replay_spill
+            if not _pid_alive(pid):
+                orphans.append(path)
+        # Arquivo compartilhado das versões anteriores (um transbordo por todos os processos)
+        if os.path.exists(self.spill_path):
+            orphans.append(self.spill_path)
+        # O .replay deste processo primeiro: os demais são renomeados para o mesmo caminho
+        return sorted(orphans, key=lambda path: path != self._replay_path(os.getpid()))
+
+    def replay_spill(self) -> int:
+        """Grava no banco os eventos do arquivo de transbordo; retorna quantos foram gravados"""
+        if not self.spill_path:
+            return 0
+
+        own_path = self._replay_path(os.getpid())
+        written = 0
+        for path in self._orphaned_files():
+            if path != own_path:
+                if os.path.exists(own_path):
+                    break  # .replay anterior mantido para nova tentativa
+                try:
+                    os.rename(path, own_path)
+                except OSError:
+                    continue  # outro processo assumiu o arquivo
+            written += self._replay_file(own_path)
+
+        own_spill = self._spill_file(os.getpid())
+        if os.path.exists(own_spill) and not os.path.exists(own_path):
+            # Só threads deste processo escrevem em own_spill, e sempre com spill_lock
+            try:
+                with self.spill_lock:
+                    os.replace(own_spill, own_path)
+            except OSError:
+                pass
+            else:
+                written += self._replay_file(own_path)
+
+        if written:
+            logger.info(f"{written} evento(s) de auditoria recuperados do transbordo")
+        return written
+
+    def _replay_file(self, replay_path: str) -> int:
+        # O arquivo só é removido quando todas as linhas foram gravadas, devolvidas
+        # ao transbordo ou postas em quarentena
+        written = 0
+        complete = True
+        with open(replay_path, encoding="utf-8") as spill:
+            rows = []
+            for line in spill:
+                if not line.strip():
+                    continue
+                row = self._parse_spilled(line)
+                if row is None:
+                    self._quarantine(line)
+                    continue
+                rows.append(row)
+                if len(rows) >= self.batch_size:
+                    batch_written, batch_complete = self._replay_batch(rows)
+                    written, complete = written + batch_written, complete and batch_complete
+                    rows = []
+            if rows:
+                batch_written, batch_complete = self._replay_batch(rows)
+                written, complete = written + batch_written, complete and batch_complete
+
+        if complete:
+            os.remove(replay_path)
+        else:
+            logger.error(f"Transbordo de auditoria mantido para nova tentativa: {replay_path}")
+        return written
+
+    def _replay_batch(self, rows: List[Dict]) -> tuple:
+        if self._write(rows):
+            return len(rows), True
+        return 0, self._spill(rows, reason="db_error")
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """Grava imediatamente tudo o que está na fila"""
+        written = 0
+        while True:
+            batch = self._drain(timeout=None)
+            if not batch:
+                break
+            if self._write(batch):
+                written += len(batch)
+            else:
+                self._spill(batch, reason="db_error")
+            AUDIT_QUEUE_DEPTH.set(self.queue.qsize())
+        return written
+
+    def _run(self):
+        replay = True  # reprocessa o transbordo ao iniciar
+        while not self.stop_event.is_set():
+            try:
+                if replay:
+                    replay = False
+                    self.replay_spill()
+                batch = self._drain(timeout=self.flush_interval)
+                if batch:
+                    if not self._write(batch):
+                        self._spill(batch, reason="db_error")
+                    AUDIT_QUEUE_DEPTH.set(self.queue.qsize())
+                elif self.spill_path and os.path.exists(self._spill_file(os.getpid())):
+                    replay = True
+            except Exception as e:
+                # A thread nunca morre: um erro inesperado só adia o próximo ciclo
+                logger.error(f"Erro na thread de auditoria: {str(e)}")
+                self.stop_event.wait(self.flush_interval)
+
+    def close(self, timeout: float = 5.0):
+        """Para a thread e grava o que restou na fila (chamado no encerramento do worker)"""
+        self.stop_event.set()
+        if self.thread and self.pid == os.getpid():
+            self.thread.join(timeout=timeout)
+        self.flush()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_sink: Optional[AuditSink] = None
+
+
+def setup_audit(engine: Engine, **kwargs) -> AuditSink:
+    """
+    Cria o sink de auditoria, registra-o em log_business_event e garante o
+    flush no encerramento do processo
+    """
+    from core.logging import add_business_event_sink
+
+    global _sink
+    _sink = AuditSink(engine, **kwargs)
+    add_business_event_sink(_sink.record)
+    atexit.register(_sink.close)
+    return _sink
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Index, create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
+from typing import List
 from core.settings import settings
 
 engine = create_engine(settings.DATABASE_URL)
@@ -14,3 +15,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def missing_indexes(table, bind=None) -> List[Index]:
+    """Índices declarados no modelo que ainda não existem no banco"""
+    existing = {index["name"] for index in inspect(bind or engine).get_indexes(table.name)}
+    return [index for index in table.indexes if index.name not in existing]
+
+def ensure_indexes(table) -> List[str]:
+    """
+    Cria os índices declarados no modelo que ainda não existem (create_all não altera tabelas existentes)
+
+    No PostgreSQL um CREATE INDEX comum bloqueia escritas durante todo o build,
+    então os índices pendentes são apenas devolvidos; crie-os online com
+    python -m migrations.event_indexes.
+
+    Returns:
+        Nomes dos índices pendentes que não foram criados
+    """
+    pending = missing_indexes(table)
+    if engine.dialect.name == "postgresql":
+        return [index.name for index in pending]
+    for index in pending:
+        index.create(bind=engine, checkfirst=True)
+    return []
+
+def ensure_columns(table):
+    """Adiciona as colunas declaradas no modelo que ainda não existem na tabela (sempre nullable)"""
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=engine.dialect)
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
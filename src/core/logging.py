@@ -1,6 +1,9 @@
 import logging
 import sys
-from typing import Optional
+from typing import Callable, List, Optional
+
+# Destinos adicionais dos eventos de negócio (ex.: trilha de auditoria)
+_business_event_sinks: List[Callable[[str, str, dict], None]] = []
 
 
 class ColoredFormatter(logging.Formatter):
@@ -138,4 +141,21 @@ def log_business_event(logger: logging.Logger, event: str, details: dict = None)
     if details:
         details_str = " | ".join([f"{k}={v}" for k, v in details.items()])
         message += f" | {details_str}"
-    logger.info(message)
\ No newline at end of file
+    logger.info(message)
+    
+    for sink in _business_event_sinks:
+        try:
+            sink(event, logger.name, details or {})
+        except Exception as e:
+            logger.warning(f"Falha ao enviar evento de negócio para {sink}: {str(e)}")
+
+
+def add_business_event_sink(sink: Callable[[str, str, dict], None]):
+    """
+    Registra um destino adicional para os eventos de negócio
+    
+    Args:
+        sink: Função chamada com (evento, nome do logger, detalhes); deve ser rápida
+    """
+    if sink not in _business_event_sinks:
+        _business_event_sinks.append(sink)
\ No newline at end of file
@@ -0,0 +1,177 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core.settings import settings
+from core.logging import get_logger
+
+logger = get_logger("query_budget")
+
+BUDGET_VIOLATIONS = Counter(
+    "query_budget_violations_total",
+    "Requisições rejeitadas por exceder o orçamento de consulta",
+    ["endpoint", "budget"],
+)
+
+# Código SQLSTATE do PostgreSQL para query_canceled (statement_timeout)
+PG_QUERY_CANCELED = "57014"
+
+# Intervalo, em instruções da VM do SQLite, entre verificações do prazo
+SQLITE_PROGRESS_STEPS = 1000
+
+# Chaves em Session.info: timeout ativo (ms) e conexão SQLite com progress handler
+_TIMEOUT_KEY = "query_budget.timeout_ms"
+_SQLITE_CONNECTION_KEY = "query_budget.sqlite_connection"
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, endpoint: str, message: str):
+        super().__init__(message)
+        self.endpoint = endpoint
+
+
+class PageSizeExceeded(QueryBudgetExceeded):
+    pass
+
+
+class StatementTimeoutExceeded(QueryBudgetExceeded):
+    pass
+
+
+def parse_overrides(raw: str) -> Dict[str, int]:
+    """
+    Converte "api.read_events=2000,pages.list_events_page=3000" em dicionário
+
+    Args:
+        raw: Pares endpoint=valor separados por vírgula
+
+    Returns:
+        Dicionário endpoint -> valor inteiro
+    """
+    overrides = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        endpoint, value = item.split("=", 1)
+        try:
+            overrides[endpoint.strip()] = int(value.strip())
+        except ValueError:
+            logger.warning(f"Valor de orçamento inválido ignorado: {item.strip()}")
+    return overrides
+
+
+_page_size_limits = parse_overrides(settings.PAGE_SIZE_LIMITS)
+_statement_timeouts = parse_overrides(settings.STATEMENT_TIMEOUTS)
+
+
+def max_page_size(endpoint: str) -> int:
+    return _page_size_limits.get(endpoint, settings.MAX_PAGE_SIZE)
+
+
+def timeout_ms(endpoint: str) -> int:
+    return _statement_timeouts.get(endpoint, settings.STATEMENT_TIMEOUT_MS)
+
+
+def check_page_size(endpoint: str, skip: int, limit: int):
+    """
+    Valida skip/limit contra o orçamento do endpoint
+
+    Raises:
+        PageSizeExceeded: Se limit ou skip estiverem fora dos limites configurados
+    """
+    max_limit = max_page_size(endpoint)
+    if limit < 0 or limit > max_limit:
+        BUDGET_VIOLATIONS.labels(endpoint=endpoint, budget="page_size").inc()
+        raise PageSizeExceeded(endpoint, f"limit deve estar entre 0 e {max_limit}")
+    if skip < 0 or skip > settings.MAX_SKIP:
+        BUDGET_VIOLATIONS.labels(endpoint=endpoint, budget="page_size").inc()
+        raise PageSizeExceeded(endpoint, f"skip deve estar entre 0 e {settings.MAX_SKIP}")
+
+
+def _is_timeout(error: OperationalError) -> bool:
+    original = getattr(error, "orig", None)
+    if getattr(original, "pgcode", None) == PG_QUERY_CANCELED:
+        return True
+    return "interrupted" in str(original).lower()
+
+
+def _apply_timeout(session: Session, connection):
+    timeout = session.info.get(_TIMEOUT_KEY)
+    if not timeout:
+        return
+
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text("SELECT set_config('statement_timeout', :value, true)"), {"value": f"{timeout}ms"})
+    elif dialect == "sqlite":
+        deadline = time.monotonic() + timeout / 1000
+        raw_connection = connection.connection.dbapi_connection
+        raw_connection.set_progress_handler(lambda: int(time.monotonic() > deadline), SQLITE_PROGRESS_STEPS)
+        session.info[_SQLITE_CONNECTION_KEY] = raw_connection
+
+
+def _clear_timeout(session: Session):
+    # Executado antes de a conexão voltar ao pool, onde outra requisição pode pegá-la
+    raw_connection = session.info.pop(_SQLITE_CONNECTION_KEY, None)
+    if raw_connection is not None:
+        raw_connection.set_progress_handler(None, 0)
+
+
+@event.listens_for(Session, "after_begin")
+def _on_begin(session, transaction, connection):
+    _apply_timeout(session, connection)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    _clear_timeout(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session):
+    _clear_timeout(session)
+
+
+@contextmanager
+def statement_timeout(db: Session, endpoint: str, timeout: Optional[int] = None):
+    """
+    Aplica o timeout de statement do endpoint a cada transação da sessão
+
+    O timeout é reaplicado no início de cada transação (inclusive as abertas
+    após um commit) e removido ao fim dela. No PostgreSQL usa SET LOCAL
+    statement_timeout; no SQLite interrompe a consulta via progress handler.
+
+    Args:
+        db: Sessão do banco
+        endpoint: Nome do endpoint (ex.: api.read_events), usado na configuração e nas métricas
+        timeout: Timeout em ms; por padrão o configurado para o endpoint
+
+    Raises:
+        StatementTimeoutExceeded: Se alguma consulta exceder o timeout
+    """
+    timeout = timeout_ms(endpoint) if timeout is None else timeout
+    if timeout <= 0:
+        yield db
+        return
+
+    db.info[_TIMEOUT_KEY] = timeout
+    if db.in_transaction():
+        _apply_timeout(db, db.connection())
+
+    try:
+        yield db
+    except OperationalError as e:
+        if not _is_timeout(e):
+            raise
+        db.rollback()
+        BUDGET_VIOLATIONS.labels(endpoint=endpoint, budget="statement_timeout").inc()
+        logger.warning(f"Timeout de {timeout}ms excedido em {endpoint}")
+        raise StatementTimeoutExceeded(endpoint, f"Consulta excedeu {timeout}ms") from e
+    finally:
+        db.info.pop(_TIMEOUT_KEY, None)
+        _clear_timeout(db)
@@ -14,11 +14,41 @@ class Settings(BaseSettings):
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
+    WORKER_THREADS: int = int(os.getenv("WORKER_THREADS", "4"))  # --threads do Gunicorn
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO" if not os.getenv("DEBUG", "False").lower() == "true" else "DEBUG")
     LOG_FORMAT: str = os.getenv("LOG_FORMAT", "colored")  # colored | simple
     
+    # Orçamento de consultas
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "500"))
+    MAX_SKIP: int = int(os.getenv("MAX_SKIP", "10000"))
+    PAGE_SIZE_LIMITS: str = os.getenv("PAGE_SIZE_LIMITS", "")  # endpoint=limite,endpoint=limite
+    STATEMENT_TIMEOUT_MS: int = int(os.getenv("STATEMENT_TIMEOUT_MS", "5000"))
+    STATEMENT_TIMEOUTS: str = os.getenv("STATEMENT_TIMEOUTS", "")  # endpoint=ms,endpoint=ms
+    BUDGET_RETRY_AFTER: int = int(os.getenv("BUDGET_RETRY_AFTER", "5"))
+    COUNT_CAP: int = int(os.getenv("COUNT_CAP", "1000"))  # máximo de linhas contadas em buscas
+    
+    # Controle de admissão (load shedding)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "True").lower() == "true"
+    ADMISSION_INITIAL_LIMIT: int = int(os.getenv("ADMISSION_INITIAL_LIMIT", "0"))  # 0 = WORKER_THREADS
+    ADMISSION_MIN_LIMIT: int = int(os.getenv("ADMISSION_MIN_LIMIT", "2"))
+    ADMISSION_MAX_LIMIT: int = int(os.getenv("ADMISSION_MAX_LIMIT", "0"))  # 0 = WORKER_THREADS
+    ADMISSION_TARGET_LATENCY_MS: int = int(os.getenv("ADMISSION_TARGET_LATENCY_MS", "500"))
+    ADMISSION_LIST_SHARE: float = float(os.getenv("ADMISSION_LIST_SHARE", "0.75"))  # fração do limite para listagens
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))
+    
+    # Trilha de auditoria (write-behind)
+    AUDIT_ENABLED: bool = os.getenv("AUDIT_ENABLED", "True").lower() == "true"
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL_MS: int = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "1000"))
+    AUDIT_SPILL_PATH: str = os.getenv("AUDIT_SPILL_PATH", "/tmp/encontros-tech-audit.jsonl")  # vazio descarta
+    
+    # Feed iCalendar (/events.ics)
+    ICAL_CACHE_SIZE: int = int(os.getenv("ICAL_CACHE_SIZE", "20000"))  # blocos VEVENT em cache por processo
+    ICAL_MAX_AGE: int = int(os.getenv("ICAL_MAX_AGE", "300"))  # Cache-Control max-age em segundos
+    
     # Telemetry
     SERVICE_NAME: str = os.getenv("SERVICE_NAME", "encontros-tech")
     SERVICE_VERSION: str = os.getenv("SERVICE_VERSION", "1.0.0")
@@ -0,0 +1,148 @@
+"""
+Benchmark da consulta "próximos N eventos" com e sem índice em Event.date
+
+Mostra o plano de execução (o passo de ordenação some com o índice) e a
+latência da mesma consulta de event_service.get_events(upcoming=True), feita
+numa tabela própria (bench_events, removida ao final): o benchmark nunca toca
+a tabela events da aplicação, mesmo apontado para o banco real.
+
+Uso (a partir de src/):
+    python -m loadtest.bench_date_index --rows 1000000
+    python -m loadtest.bench_date_index --database-url postgresql://... --rows 2000000
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData, Table, create_engine, select, text
+from sqlalchemy.engine import Engine
+
+from loadtest.runner import percentile
+from models.event import Event
+
+TABLE = "bench_events"
+INDEX = "ix_bench_events_date"
+
+
+def _bench_table() -> Table:
+    # Mesmas colunas de events, sem índices: o índice em date é criado pelo benchmark
+    table = Event.__table__.to_metadata(MetaData(), name=TABLE)
+    table.indexes.clear()
+    return table
+
+
+def _populate(engine: Engine, table: Table, rows: int, seed: int = 42, chunk: int = 50000):
+    rng = random.Random(seed)
+    start = datetime.datetime.now() - datetime.timedelta(days=3 * 365)
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            conn.execute(table.insert(), [
+                {
+                    "title": f"Evento {i}",
+                    "description": "Benchmark",
+                    "date": start + datetime.timedelta(minutes=rng.randrange(6 * 365 * 24 * 60)),
+                    "location": f"Cidade {i % 50}",
+                }
+                for i in range(offset, min(offset + chunk, rows))
+            ])
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def _upcoming_query(table: Table, limit: int):
+    # Equivalente a get_events(upcoming=True): date >= agora, ordenado por date
+    return select(table).where(table.c.date >= datetime.datetime.now()).order_by(table.c.date).limit(limit)
+
+
+def _plan(engine: Engine, table: Table, limit: int) -> List[str]:
+    sql = str(_upcoming_query(table, limit).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            return [row[0] for row in conn.execute(text(f"EXPLAIN {sql}"))]
+        return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def _has_sort(plan: List[str]) -> bool:
+    return any("TEMP B-TREE FOR ORDER BY" in line or "Sort" in line for line in plan)
+
+
+def _latencies(engine: Engine, table: Table, limit: int, repeat: int) -> List[float]:
+    latencies = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            events = conn.execute(_upcoming_query(table, limit)).all()
+            latencies.append(time.perf_counter() - start)
+            assert len(events) == limit
+    return sorted(latencies)
+
+
+def run_benchmark(engine: Engine, rows: int, limit: int = 20, repeat: int = 50) -> Dict[str, Dict]:
+    """
+    Executa a consulta de próximos eventos sem e com o índice em date
+
+    Returns:
+        Plano, presença de sort e latências (ms) por variante
+    """
+    table = _bench_table()
+    table.drop(bind=engine, checkfirst=True)
+    table.create(bind=engine)
+    try:
+        _populate(engine, table, rows)
+
+        results = {}
+        for variant in ("sem_indice", "com_indice"):
+            if variant == "com_indice":
+                with engine.begin() as conn:
+                    conn.execute(text(f"CREATE INDEX {INDEX} ON {TABLE} (date)"))
+                    if engine.dialect.name == "postgresql":
+                        conn.execute(text(f"ANALYZE {TABLE}"))
+            plan = _plan(engine, table, limit)
+            latencies = _latencies(engine, table, limit, repeat)
+            results[variant] = {
+                "plan": plan,
+                "sort": _has_sort(plan),
+                "latency_ms": {
+                    "mean": round(statistics.mean(latencies) * 1000, 2),
+                    "p50": round(percentile(latencies, 50) * 1000, 2),
+                    "p95": round(percentile(latencies, 95) * 1000, 2),
+                },
+            }
+        return results
+    finally:
+        table.drop(bind=engine, checkfirst=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de próximos eventos com índice em date")
+    parser.add_argument("--database-url", help="Banco alvo (usa a tabela bench_events, removida ao final); por padrão um SQLite temporário")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-date-") as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        results = run_benchmark(engine, args.rows, args.limit, args.repeat)
+        engine.dispose()
+
+    print(f"Banco: {engine.dialect.name} | linhas: {args.rows} | próximos {args.limit} eventos")
+    for variant, stats in results.items():
+        lat = stats["latency_ms"]
+        print(f"\n[{variant}] sort: {'sim' if stats['sort'] else 'não'} | "
+              f"média {lat['mean']} ms | p50 {lat['p50']} ms | p95 {lat['p95']} ms")
+        for line in stats["plan"]:
+            print(f"    {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
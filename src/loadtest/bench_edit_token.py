@@ -0,0 +1,168 @@
+"""
+Benchmark de edit_token: texto (VARCHAR 36) vs. formato compacto (UUID / BLOB 16)
+
+Mede o tamanho do índice único e a latência de busca por token em tabelas
+com alguns milhões de linhas.
+
+Uso (a partir de src/):
+    python -m loadtest.bench_edit_token --rows 2000000
+    python -m loadtest.bench_edit_token --database-url postgresql://... --rows 3000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from loadtest.runner import percentile
+
+VARIANTS = ("text", "compact")
+
+
+def _placeholder(engine: Engine) -> str:
+    return "?" if engine.dialect.paramstyle == "qmark" else "%s"
+
+
+def _to_param(engine: Engine, variant: str, token: str):
+    if variant == "text":
+        return token
+    if engine.dialect.name == "postgresql":
+        return token  # o PostgreSQL converte a string para uuid
+    return uuid.UUID(token).bytes
+
+
+def _create_table(engine: Engine, variant: str):
+    if variant == "text":
+        column_type = "VARCHAR"
+    else:
+        column_type = "UUID" if engine.dialect.name == "postgresql" else "BLOB"
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS bench_token_{variant}"))
+        conn.execute(text(f"CREATE TABLE bench_token_{variant} (id INTEGER PRIMARY KEY, edit_token {column_type})"))
+
+
+def _load(engine: Engine, variant: str, tokens: List[str], chunk: int = 50000):
+    mark = _placeholder(engine)
+    cast = "::uuid" if variant == "compact" and engine.dialect.name == "postgresql" else ""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, len(tokens), chunk):
+            rows = [(start + i + 1, _to_param(engine, variant, t)) for i, t in enumerate(tokens[start:start + chunk])]
+            cursor.executemany(
+                f"INSERT INTO bench_token_{variant} (id, edit_token) VALUES ({mark}, {mark}{cast})", rows
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _index_size(engine: Engine, variant: str) -> int:
+    """Cria o índice único e devolve seu tamanho em bytes"""
+    index = f"ix_bench_token_{variant}"
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text(f"CREATE UNIQUE INDEX {index} ON bench_token_{variant} (edit_token)"))
+            conn.execute(text(f"ANALYZE bench_token_{variant}"))
+            return conn.execute(text("SELECT pg_relation_size(:name)"), {"name": index}).scalar()
+
+        # No SQLite o tamanho do índice é o aumento de páginas em uso ao criá-lo
+        def used_pages():
+            return (conn.execute(text("PRAGMA page_count")).scalar()
+                    - conn.execute(text("PRAGMA freelist_count")).scalar())
+
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        before = used_pages()
+        conn.execute(text(f"CREATE UNIQUE INDEX {index} ON bench_token_{variant} (edit_token)"))
+        return (used_pages() - before) * page_size
+
+
+def _lookups(engine: Engine, variant: str, sample: List[str]) -> List[float]:
+    mark = _placeholder(engine)
+    cast = "::uuid" if variant == "compact" and engine.dialect.name == "postgresql" else ""
+    sql = f"SELECT id FROM bench_token_{variant} WHERE edit_token = {mark}{cast}"
+    raw = engine.raw_connection()
+    latencies = []
+    try:
+        cursor = raw.cursor()
+        for token in sample:
+            start = time.perf_counter()
+            cursor.execute(sql, (_to_param(engine, variant, token),))
+            row = cursor.fetchone()
+            latencies.append(time.perf_counter() - start)
+            assert row is not None
+        raw.rollback()
+    finally:
+        raw.close()
+    return latencies
+
+
+def run_benchmark(engine: Engine, rows: int, lookups: int, seed: int = 42) -> Dict[str, Dict]:
+    """
+    Executa o benchmark para as duas representações do token
+
+    Args:
+        engine: Engine do banco onde as tabelas temporárias serão criadas
+        rows: Quantidade de linhas por tabela
+        lookups: Quantidade de buscas por token medidas
+        seed: Semente para gerar tokens e a amostra de buscas
+
+    Returns:
+        Métricas por variante (index_bytes e latências em microssegundos)
+    """
+    rng = random.Random(seed)
+    tokens = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(rows)]
+    sample = [rng.choice(tokens) for _ in range(lookups)]
+
+    results = {}
+    for variant in VARIANTS:
+        _create_table(engine, variant)
+        _load(engine, variant, tokens)
+        index_bytes = _index_size(engine, variant)
+        _lookups(engine, variant, sample[: max(1, lookups // 10)])  # aquecimento do cache
+        latencies = sorted(_lookups(engine, variant, sample))
+        results[variant] = {
+            "index_bytes": index_bytes,
+            "lookup_us": {
+                "mean": round(statistics.mean(latencies) * 1e6, 2),
+                "p50": round(percentile(latencies, 50) * 1e6, 2),
+                "p99": round(percentile(latencies, 99) * 1e6, 2),
+            },
+        }
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE bench_token_{variant}"))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de edit_token texto vs. compacto")
+    parser.add_argument("--database-url", help="Banco alvo; por padrão um SQLite temporário")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-token-") as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        results = run_benchmark(engine, args.rows, args.lookups)
+        engine.dispose()
+
+    text_stats, compact_stats = results["text"], results["compact"]
+    print(f"Banco: {engine.dialect.name} | linhas: {args.rows} | buscas: {args.lookups}")
+    print(f"{'variante':<10} {'índice (MiB)':>14} {'média (µs)':>12} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+    for variant, stats in results.items():
+        lat = stats["lookup_us"]
+        print(f"{variant:<10} {stats['index_bytes'] / 2**20:>14.1f} {lat['mean']:>12} {lat['p50']:>10} {lat['p99']:>10}")
+    print(f"Índice compacto: {compact_stats['index_bytes'] / text_stats['index_bytes']:.0%} do tamanho em texto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
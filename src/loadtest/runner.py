@@ -0,0 +1,343 @@
+"""
+Gerador de carga baseado nos cenários de api-requests.http
+
+Uso (a partir de src/):
+    python -m loadtest.runner --spawn --mix read-heavy --concurrency 16 --duration 30
+    python -m loadtest.runner --base-url http://localhost:8000 --compare baseline.json
+"""
+import argparse
+import datetime
+import http.client
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from loadtest.scenarios import DEFAULT_HTTP_FILE, MIXES, Scenario, ScenarioPicker, load_scenarios
+
+REPORT_VERSION = 1
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank sobre uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Resume latências (em segundos) em throughput, taxa de erro e percentis em ms"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / count * 1000, 2) if count else 0.0,
+            "p50": round(percentile(values, 50) * 1000, 2),
+            "p90": round(percentile(values, 90) * 1000, 2),
+            "p95": round(percentile(values, 95) * 1000, 2),
+            "p99": round(percentile(values, 99) * 1000, 2),
+            "max": round(values[-1] * 1000, 2) if count else 0.0,
+        },
+    }
+
+
+class Recorder:
+    """Acumula latência e erros por endpoint, compartilhado entre as threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, latency: float, status: Optional[int]):
+        is_error = status is None or status >= 400
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(latency)
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + (1 if is_error else 0)
+            by_status = self.statuses.setdefault(endpoint, {})
+            key = str(status) if status is not None else "connection_error"
+            by_status[key] = by_status.get(key, 0) + 1
+
+    def report(self, elapsed: float) -> Dict:
+        all_latencies = [lat for values in self.latencies.values() for lat in values]
+        endpoints = {}
+        for endpoint in sorted(self.latencies):
+            endpoints[endpoint] = summarize(self.latencies[endpoint], self.errors[endpoint], elapsed)
+            endpoints[endpoint]["status_codes"] = self.statuses[endpoint]
+        return {
+            "duration_s": round(elapsed, 2),
+            "totals": summarize(all_latencies, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints,
+        }
+
+
+def _send(conn: http.client.HTTPConnection, scenario: Scenario) -> int:
+    body = scenario.body.encode("utf-8") if scenario.body else None
+    conn.request(scenario.method, scenario.path, body=body, headers=scenario.headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def _worker(target: str, picker: ScenarioPicker, recorder: Recorder, deadline: float,
+            budget: "_Budget", timeout: float):
+    parts = urlsplit(target)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    try:
+        while time.perf_counter() < deadline and budget.take():
+            scenario = picker.pick()
+            start = time.perf_counter()
+            try:
+                status = _send(conn, scenario)
+            except (OSError, http.client.HTTPException):
+                status = None
+                conn.close()
+            recorder.record(scenario.endpoint, time.perf_counter() - start, status)
+    finally:
+        conn.close()
+
+
+class _Budget:
+    """Limite opcional de requisições totais entre todas as threads"""
+
+    def __init__(self, total: Optional[int]):
+        self.remaining = total
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.remaining is None:
+            return True
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def run_load(
+    scenarios: List[Scenario],
+    mix: str = "read-heavy",
+    concurrency: int = 8,
+    duration: float = 30.0,
+    max_requests: Optional[int] = None,
+    timeout: float = 30.0,
+    seed: Optional[int] = None,
+) -> Dict:
+    """
+    Executa os cenários com concorrência fixa e devolve o relatório agregado
+
+    Args:
+        scenarios: Cenários carregados do arquivo .http
+        mix: Perfil de carga (read-heavy, write-heavy, search-heavy)
+        concurrency: Número de clientes simultâneos
+        duration: Duração máxima em segundos
+        max_requests: Número máximo de requisições (opcional)
+        timeout: Timeout de cada requisição em segundos
+        seed: Semente para reproduzir a sequência de cenários
+
+    Returns:
+        Dicionário com totais e métricas por endpoint
+    """
+    target = scenarios[0].url
+    recorder = Recorder()
+    budget = _Budget(max_requests)
+    start = time.perf_counter()
+    deadline = start + duration
+
+    threads = []
+    for i in range(concurrency):
+        picker = ScenarioPicker(scenarios, mix, seed=None if seed is None else seed + i)
+        thread = threading.Thread(
+            target=_worker, args=(target, picker, recorder, deadline, budget, timeout), daemon=True
+        )
+        threads.append(thread)
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return recorder.report(time.perf_counter() - start)
+
+
+def _wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/", timeout=2) as response:
+                if response.status < 500:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Aplicação não respondeu em {timeout}s: {base_url}")
+
+
+@contextmanager
+def local_gunicorn(port: int = 8099, workers: int = 4, threads: int = 4, database_url: Optional[str] = None):
+    """
+    Sobe um gunicorn local com a aplicação sobre SQLite e o encerra ao final
+
+    Args:
+        port: Porta local do gunicorn
+        workers: Número de workers (o Dockerfile usa 4 por réplica)
+        threads: Threads por worker (o Dockerfile usa 4)
+        database_url: URL do banco; por padrão um SQLite temporário
+
+    Yields:
+        Base URL da aplicação
+    """
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = database_url or f"sqlite:///{tmp}/loadtest.db"
+        env["LOG_LEVEL"] = "WARNING"
+        env["WORKER_THREADS"] = str(threads)
+
+        # Cria o schema antes de subir os workers para evitar corrida no create_all
+        subprocess.run([sys.executable, "-c", "import main"], cwd=SRC_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+        process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}",
+             "--workers", str(workers), "--threads", str(threads), "--log-level", "warning", "main:app"],
+            cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_ready(base_url)
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def suggest_replicas(throughput_rps: float, target_rps: float, headroom: float = 0.7) -> int:
+    """Réplicas necessárias para target_rps operando a headroom da capacidade medida"""
+    if throughput_rps <= 0:
+        return 0
+    return max(1, math.ceil(target_rps / (throughput_rps * headroom)))
+
+
+def compare_reports(current: Dict, baseline: Dict) -> List[str]:
+    """Linhas de comparação de throughput e p95 entre dois relatórios"""
+    lines = [f"{'endpoint':<40} {'rps':>18} {'p95 ms':>22} {'erros':>14}"]
+
+    def row(name, cur, base):
+        if base is None:
+            return f"{name:<40} {cur['throughput_rps']:>18} {cur['latency_ms']['p95']:>22} {cur['error_rate']:>14}"
+
+        def delta(a, b):
+            return f"{a} ({(a - b) / b * 100:+.1f}%)" if b else f"{a}"
+
+        return (f"{name:<40} {delta(cur['throughput_rps'], base['throughput_rps']):>18} "
+                f"{delta(cur['latency_ms']['p95'], base['latency_ms']['p95']):>22} "
+                f"{cur['error_rate']:>6} ({base['error_rate']})")
+
+    lines.append(row("TOTAL", current["totals"], baseline.get("totals")))
+    for endpoint, stats in current["endpoints"].items():
+        lines.append(row(endpoint, stats, baseline.get("endpoints", {}).get(endpoint)))
+    return lines
+
+
+def format_report(report: Dict) -> List[str]:
+    lines = [
+        f"Alvo: {report['target']} | perfil: {report['mix']} | concorrência: {report['concurrency']} "
+        f"| workers: {report['workers'] or '-'} | duração: {report['duration_s']}s",
+        f"{'endpoint':<40} {'req':>7} {'rps':>9} {'erro%':>7} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8}",
+    ]
+    rows = [("TOTAL", report["totals"])] + list(report["endpoints"].items())
+    for name, stats in rows:
+        lat = stats["latency_ms"]
+        lines.append(
+            f"{name:<40} {stats['requests']:>7} {stats['throughput_rps']:>9} "
+            f"{stats['error_rate'] * 100:>6.2f}% {lat['p50']:>8} {lat['p90']:>8} {lat['p95']:>8} {lat['p99']:>8}"
+        )
+    if report.get("suggested_replicas") is not None:
+        lines.append(
+            f"Réplicas sugeridas para {report['target_rps']} req/s: {report['suggested_replicas']}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga a partir de api-requests.http")
+    parser.add_argument("--http-file", type=Path, default=DEFAULT_HTTP_FILE)
+    parser.add_argument("--base-url", help="Aplicação já em execução (ignorado com --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Sobe um gunicorn local com SQLite")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--max-requests", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--target-rps", type=float, help="Carga esperada para sugerir réplicas")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON para salvar o relatório")
+    parser.add_argument("--compare", type=Path, help="Relatório JSON anterior para comparação")
+    args = parser.parse_args(argv)
+
+    def execute(base_url: str) -> Dict:
+        scenarios = load_scenarios(args.http_file, base_url=base_url)
+        if not scenarios:
+            raise SystemExit(f"Nenhum cenário encontrado em {args.http_file}")
+        return run_load(scenarios, mix=args.mix, concurrency=args.concurrency,
+                        duration=args.duration, max_requests=args.max_requests, seed=args.seed)
+
+    if args.spawn:
+        with local_gunicorn(port=args.port, workers=args.workers, threads=args.threads) as base_url:
+            results = execute(base_url)
+    else:
+        base_url = args.base_url or "http://localhost:8000"
+        results = execute(base_url)
+
+    report = {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "target": base_url,
+        "database": "sqlite" if args.spawn else None,
+        "workers": args.workers if args.spawn else None,
+        "threads": args.threads if args.spawn else None,
+        "mix": args.mix,
+        "mix_weights": MIXES[args.mix],
+        "concurrency": args.concurrency,
+        "target_rps": args.target_rps,
+        "suggested_replicas": None,
+        **results,
+    }
+    if args.target_rps:
+        report["suggested_replicas"] = suggest_replicas(report["totals"]["throughput_rps"], args.target_rps)
+
+    print("\n".join(format_report(report)))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"\nComparação com {args.compare}:")
+        print("\n".join(compare_reports(report, baseline)))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nRelatório salvo em {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
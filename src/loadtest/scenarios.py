@@ -0,0 +1,171 @@
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, quote, urlsplit
+
+# Arquivo REST Client mantido na raiz do repositório
+DEFAULT_HTTP_FILE = Path(__file__).resolve().parents[2] / "api-requests.http"
+
+# Pesos de cada categoria de cenário por perfil de carga
+MIXES: Dict[str, Dict[str, int]] = {
+    "read-heavy": {"read": 80, "search": 10, "write": 10},
+    "write-heavy": {"read": 30, "search": 10, "write": 60},
+    "search-heavy": {"read": 20, "search": 70, "write": 10},
+}
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+_VARIABLE_RE = re.compile(r"^@(\w+)\s*=\s*(.*)$")
+_REQUEST_LINE_RE = re.compile(r"^(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\s+(.+?)(?:\s+HTTP/[\d.]+)?$")
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+@dataclass
+class Scenario:
+    """Requisição extraída do arquivo .http"""
+
+    name: str
+    method: str
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Path com query string codificada (o arquivo .http usa espaços e acentos)"""
+        parts = urlsplit(self.url)
+        path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        return quote(path, safe="/?&=%+:,")
+
+    @property
+    def category(self) -> str:
+        """Classifica o cenário em read, search ou write"""
+        if self.method in WRITE_METHODS:
+            return "write"
+        query = dict(parse_qsl(urlsplit(self.url).query))
+        if query.get("search"):
+            return "search"
+        return "read"
+
+    @property
+    def endpoint(self) -> str:
+        """Chave de agregação: método, path e nomes dos parâmetros (sem valores)"""
+        parts = urlsplit(self.url)
+        params = sorted({key for key, _ in parse_qsl(parts.query)})
+        key = f"{self.method} {parts.path}"
+        if params:
+            key += "?" + "&".join(params)
+        return key
+
+
+def _substitute(value: str, variables: Dict[str, str]) -> str:
+    return _PLACEHOLDER_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+
+
+def parse_http_file(text: str, overrides: Optional[Dict[str, str]] = None) -> List[Scenario]:
+    """
+    Converte o conteúdo de um arquivo REST Client (.http) em cenários
+
+    Args:
+        text: Conteúdo do arquivo
+        overrides: Variáveis que substituem as declaradas no arquivo (ex.: baseUrl)
+
+    Returns:
+        Lista de cenários na ordem em que aparecem no arquivo
+    """
+    variables: Dict[str, str] = {}
+    scenarios: List[Scenario] = []
+
+    name = ""
+    current: Optional[Scenario] = None
+    in_body = False
+    body_lines: List[str] = []
+
+    def finish():
+        if current is not None:
+            body = "\n".join(body_lines).strip()
+            current.body = _substitute(body, variables) if body else None
+            scenarios.append(current)
+
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+
+        if line.startswith("###"):
+            finish()
+            current, in_body, body_lines = None, False, []
+            name = line.lstrip("#").strip()
+            continue
+
+        if current is None:
+            variable = _VARIABLE_RE.match(line)
+            if variable:
+                variables[variable.group(1)] = variable.group(2).strip()
+                if overrides and variable.group(1) in overrides:
+                    variables[variable.group(1)] = overrides[variable.group(1)]
+                continue
+            request_line = _REQUEST_LINE_RE.match(line)
+            if request_line:
+                current = Scenario(
+                    name=name,
+                    method=request_line.group(1),
+                    url=_substitute(request_line.group(2), variables),
+                )
+            continue
+
+        if in_body:
+            body_lines.append(raw_line)
+        elif not line:
+            in_body = True
+        elif ":" in line and not line.startswith("#"):
+            header, value = line.split(":", 1)
+            current.headers[header.strip()] = _substitute(value.strip(), variables)
+
+    finish()
+    return scenarios
+
+
+def load_scenarios(
+    path: Path = DEFAULT_HTTP_FILE,
+    base_url: Optional[str] = None,
+    path_prefix: str = "/api/",
+) -> List[Scenario]:
+    """
+    Lê o arquivo .http e mantém apenas os cenários sob path_prefix
+
+    Args:
+        path: Caminho do arquivo .http
+        base_url: Sobrescreve a variável @baseUrl do arquivo
+        path_prefix: Prefixo de path dos cenários considerados (ignora /docs, /redoc)
+
+    Returns:
+        Lista de cenários
+    """
+    overrides = {"baseUrl": base_url.rstrip("/")} if base_url else None
+    scenarios = parse_http_file(Path(path).read_text(encoding="utf-8"), overrides)
+    return [s for s in scenarios if urlsplit(s.url).path.startswith(path_prefix)]
+
+
+class ScenarioPicker:
+    """Sorteia cenários respeitando os pesos do perfil de carga"""
+
+    def __init__(self, scenarios: List[Scenario], mix: str, seed: Optional[int] = None):
+        if mix not in MIXES:
+            raise ValueError(f"Perfil de carga desconhecido: {mix}")
+
+        self.by_category: Dict[str, List[Scenario]] = {}
+        for scenario in scenarios:
+            self.by_category.setdefault(scenario.category, []).append(scenario)
+
+        weights = {c: w for c, w in MIXES[mix].items() if self.by_category.get(c) and w > 0}
+        if not weights:
+            raise ValueError(f"Nenhum cenário disponível para o perfil {mix}")
+
+        self.categories = list(weights)
+        self.weights = [weights[c] for c in self.categories]
+        self.random = random.Random(seed)
+
+    def pick(self) -> Scenario:
+        category = self.random.choices(self.categories, weights=self.weights)[0]
+        return self.random.choice(self.by_category[category])
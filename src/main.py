@@ -3,10 +3,21 @@ from flask import Flask, request, g
 from prometheus_flask_exporter import PrometheusMetrics
 import time
 
-from core.database import engine
 from core.settings import settings
+
+# Criar diretório para métricas Prometheus multiprocessing antes de importar os
+# módulos que registram métricas na importação (admission, audit, query_budget)
+os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+from core.database import engine, get_db, ensure_columns, ensure_indexes
 from core.logging import setup_logging, get_logger, log_request
+from core import admission
+from core.audit import setup_audit
 from models import event as event_model
+from models import facet as facet_model
+from models import audit as audit_model
+from services import facet_service
+from migrations.edit_token_binary import is_migrated as edit_token_migrated, migrate as migrate_edit_token
 
 # Configurar sistema de logging
 use_colors = settings.LOG_FORMAT == "colored"
@@ -20,6 +31,52 @@ main_logger = setup_logging(
 main_logger.info("Criando tabelas no banco de dados")
 event_model.Base.metadata.create_all(bind=engine)
 
+try:
+    ensure_columns(event_model.Event.__table__)
+except Exception as e:
+    main_logger.warning(f"Não foi possível criar colunas pendentes: {str(e)}")
+
+try:
+    pending_indexes = ensure_indexes(event_model.Event.__table__)
+    if pending_indexes:
+        main_logger.warning(
+            f"Índices pendentes em events ({', '.join(pending_indexes)}) - execute: python -m migrations.event_indexes"
+        )
+except Exception as e:
+    main_logger.warning(f"Não foi possível criar índices pendentes: {str(e)}")
+
+if not edit_token_migrated(engine):
+    if engine.dialect.name == "postgresql":
+        # No PostgreSQL a string enviada é convertida para uuid; a migração pode rodar online depois
+        main_logger.warning(
+            "events.edit_token ainda está em formato texto - execute: python -m migrations.edit_token_binary"
+        )
+    else:
+        # Nos demais bancos BinaryUUID não encontra tokens em texto: migra antes de atender requisições
+        main_logger.info("Migrando events.edit_token para o formato compacto")
+        try:
+            migrate_edit_token(engine)
+        except Exception as e:
+            if not edit_token_migrated(engine):  # outro worker pode ter concluído a migração
+                raise RuntimeError(f"Falha ao migrar events.edit_token: {str(e)}") from e
+
+# Popula as facetas em bancos que já tinham eventos antes da tabela existir
+try:
+    with get_db() as db:
+        facet_service.ensure_facets(db)
+except Exception as e:
+    main_logger.warning(f"Não foi possível inicializar as facetas: {str(e)}")
+
+# Trilha de auditoria: eventos de negócio gravados em lote por uma thread em background
+if settings.AUDIT_ENABLED:
+    setup_audit(
+        engine,
+        queue_size=settings.AUDIT_QUEUE_SIZE,
+        batch_size=settings.AUDIT_BATCH_SIZE,
+        flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+        spill_path=settings.AUDIT_SPILL_PATH
+    )
+
 # Cria a aplicação Flask
 app = Flask(__name__, static_folder="static", template_folder="templates")
 app.config['SECRET_KEY'] = 'your-secret-key-here'  # TODO: Move to settings
@@ -28,9 +85,6 @@ app.config['SECRET_KEY'] = 'your-secret-key-here'  # TODO: Move to settings
 app.logger.handlers = main_logger.handlers
 app.logger.setLevel(main_logger.level)
 
-# Criar diretório para métricas Prometheus multiprocessing
-os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
-
 # Configurar Prometheus metrics
 metrics = PrometheusMetrics(app)
 
@@ -51,11 +105,22 @@ def after_request(response):
         main_logger.debug(f"Requisição completada em {duration:.3f}s")
     return response
 
+# Controle de admissão: rejeita cedo (503 + Retry-After) quando o banco está saturado
+if settings.ADMISSION_ENABLED:
+    admission.init_app(app)
+
 # Importar e registrar blueprints
 from routers import api_router, page_router
 app.register_blueprint(api_router.bp, url_prefix='/api/events')
 app.register_blueprint(page_router.bp)
 
+@app.cli.command("rebuild-facets")
+def rebuild_facets_command():
+    """Recalcula as contagens de eventos por local e por mês"""
+    with get_db() as db:
+        summary = facet_service.rebuild_facets(db)
+    print(f"Facetas reconstruídas: {summary}")
+
 main_logger.info(f"Aplicação Flask inicializada - Versão: {settings.SERVICE_VERSION}")
 main_logger.info(f"Debug mode: {settings.DEBUG} | Log level: {settings.LOG_LEVEL}")
 
@@ -0,0 +1,189 @@
+"""
+Migração online de events.edit_token: VARCHAR(36) -> UUID nativo (PostgreSQL) / BLOB(16) (SQLite)
+
+Etapas (cada uma pode ser reexecutada com segurança):
+    1. Adiciona a coluna edit_token_bin (nullable)
+    2. Preenche a nova coluna em lotes curtos, por faixa de id
+    3. Cria o índice único na nova coluna (CONCURRENTLY no PostgreSQL)
+    4. Em uma transação curta: copia as linhas criadas durante a migração e troca as colunas
+    5. (opcional, --drop-old) Remove a coluna antiga
+
+Execute antes de publicar a versão que usa BinaryUUID. A versão anterior continua
+funcionando após a troca: no PostgreSQL a string enviada é convertida para uuid.
+
+Uso (a partir de src/):
+    python -m migrations.edit_token_binary [--batch-size 5000] [--drop-old]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from core.logging import get_logger, setup_logging
+
+logger = get_logger("migrations.edit_token_binary")
+
+TABLE = "events"
+NEW_COLUMN = "edit_token_bin"
+OLD_COLUMN = "edit_token_old"
+INDEX = "ix_events_edit_token"
+
+
+def _columns(engine: Engine) -> dict:
+    return {c["name"]: c["type"] for c in inspect(engine).get_columns(TABLE)}
+
+
+def is_migrated(engine: Engine) -> bool:
+    """Indica se events.edit_token já está no formato compacto"""
+    if not inspect(engine).has_table(TABLE):
+        return True
+    columns = _columns(engine)
+    if "edit_token" not in columns:
+        return True
+    type_name = type(columns["edit_token"]).__name__.upper()
+    return type_name in ("UUID", "BLOB", "LARGEBINARY", "BINARY", "VARBINARY")
+
+
+def _add_column(engine: Engine):
+    if NEW_COLUMN in _columns(engine):
+        return
+    column_type = "UUID" if engine.dialect.name == "postgresql" else "BLOB"
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {NEW_COLUMN} {column_type}"))
+    logger.info(f"Coluna {NEW_COLUMN} adicionada")
+
+
+def _token_bytes(token) -> bytes:
+    # Linhas criadas pela versão nova antes da migração já gravaram 16 bytes na coluna de texto
+    if isinstance(token, (bytes, memoryview)):
+        return uuid.UUID(bytes=bytes(token)).bytes
+    return uuid.UUID(token).bytes
+
+
+def _backfill_range(conn, low: int, high: int) -> int:
+    if conn.dialect.name == "postgresql":
+        result = conn.execute(text(
+            f"UPDATE {TABLE} SET {NEW_COLUMN} = edit_token::uuid "
+            f"WHERE id > :low AND id <= :high AND {NEW_COLUMN} IS NULL AND edit_token IS NOT NULL"
+        ), {"low": low, "high": high})
+        return result.rowcount
+
+    rows = conn.execute(text(
+        f"SELECT id, edit_token FROM {TABLE} "
+        f"WHERE id > :low AND id <= :high AND {NEW_COLUMN} IS NULL AND edit_token IS NOT NULL"
+    ), {"low": low, "high": high}).all()
+    params = []
+    for row_id, token in rows:
+        try:
+            params.append({"id": row_id, "value": _token_bytes(token)})
+        except (TypeError, ValueError):
+            logger.warning(f"Token inválido ignorado: id={row_id}")
+    if params:
+        conn.execute(text(f"UPDATE {TABLE} SET {NEW_COLUMN} = :value WHERE id = :id"), params)
+    return len(params)
+
+
+def _backfill(engine: Engine, batch_size: int, pause: float) -> int:
+    with engine.connect() as conn:
+        low, high = conn.execute(text(f"SELECT COALESCE(MIN(id), 0) - 1, COALESCE(MAX(id), 0) FROM {TABLE}")).one()
+
+    total = 0
+    while low < high:
+        # Uma transação por lote mantém locks curtos enquanto a aplicação segue atendendo
+        with engine.begin() as conn:
+            total += _backfill_range(conn, low, low + batch_size)
+        low += batch_size
+        if pause:
+            time.sleep(pause)
+    logger.info(f"Backfill concluído: {total} linha(s)")
+    return total
+
+
+def _create_index(engine: Engine):
+    if engine.dialect.name != "postgresql":
+        return  # No SQLite o índice é criado na troca de colunas
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX}_bin ON {TABLE} ({NEW_COLUMN})"
+        ))
+    logger.info(f"Índice {INDEX}_bin criado")
+
+
+def _swap(engine: Engine):
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE"))
+        _backfill_range(conn, -1, sys.maxsize)
+        conn.execute(text(f"ALTER TABLE {TABLE} RENAME COLUMN edit_token TO {OLD_COLUMN}"))
+        conn.execute(text(f"ALTER TABLE {TABLE} RENAME COLUMN {NEW_COLUMN} TO edit_token"))
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER INDEX IF EXISTS {INDEX} RENAME TO {INDEX}_old"))
+            conn.execute(text(f"ALTER INDEX {INDEX}_bin RENAME TO {INDEX}"))
+        else:
+            conn.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+            conn.execute(text(f"CREATE UNIQUE INDEX {INDEX} ON {TABLE} (edit_token)"))
+    logger.info("Colunas trocadas: edit_token agora é compacto")
+
+
+def drop_old_column(engine: Engine):
+    """Remove a coluna de texto antiga (e seu índice) após a troca"""
+    if OLD_COLUMN not in _columns(engine):
+        return
+    if engine.dialect.name == "sqlite" and sqlite3.sqlite_version_info < (3, 35, 0):
+        logger.warning("SQLite < 3.35 não suporta DROP COLUMN; coluna antiga mantida")
+        return
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"DROP INDEX IF EXISTS {INDEX}_old"))
+        conn.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN {OLD_COLUMN}"))
+    logger.info(f"Coluna {OLD_COLUMN} removida")
+
+
+def migrate(engine: Engine, batch_size: int = 5000, pause: float = 0.0, drop_old: bool = False) -> bool:
+    """
+    Executa a migração completa
+
+    Args:
+        engine: Engine do banco
+        batch_size: Quantidade de ids por lote no backfill
+        pause: Pausa em segundos entre lotes, para reduzir a pressão no banco
+        drop_old: Remove a coluna antiga ao final
+
+    Returns:
+        True se a migração foi executada, False se já estava aplicada
+    """
+    if is_migrated(engine):
+        logger.info("events.edit_token já está no formato compacto")
+        if drop_old:
+            drop_old_column(engine)
+        return False
+
+    _add_column(engine)
+    _backfill(engine, batch_size, pause)
+    _create_index(engine)
+    _swap(engine)
+    if drop_old:
+        drop_old_column(engine)
+    return True
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migra events.edit_token para UUID/BLOB(16)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause", type=float, default=0.0)
+    parser.add_argument("--drop-old", action="store_true")
+    args = parser.parse_args(argv)
+
+    setup_logging(service_name="encontros-tech")
+    from core.database import engine
+    migrate(engine, batch_size=args.batch_size, pause=args.pause, drop_old=args.drop_old)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
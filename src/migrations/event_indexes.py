@@ -0,0 +1,83 @@
+"""
+Criação online dos índices declarados em Event que ainda não existem no banco
+
+No PostgreSQL usa CREATE INDEX CONCURRENTLY, sem bloquear escritas em events;
+índices deixados inválidos por uma execução interrompida são removidos e
+recriados. Nos demais bancos os índices são criados diretamente (a aplicação
+já faz isso na inicialização).
+
+Uso (a partir de src/):
+    python -m migrations.event_indexes
+"""
+import sys
+from typing import List, Optional
+
+from sqlalchemy import Index, text
+from sqlalchemy.engine import Engine
+
+from core.logging import get_logger, setup_logging
+
+logger = get_logger("migrations.event_indexes")
+
+
+def create_index_sql(index: Index) -> str:
+    """DDL de CREATE INDEX CONCURRENTLY para o índice"""
+    unique = "UNIQUE " if index.unique else ""
+    columns = ", ".join(column.name for column in index.columns)
+    return f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {index.name} ON {index.table.name} ({columns})"
+
+
+def _invalid_indexes(conn, table_name: str) -> List[str]:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisvalid"
+    ), {"table": table_name}).scalars())
+
+
+def create_indexes(engine: Engine, table) -> List[str]:
+    """
+    Cria os índices pendentes da tabela
+
+    Args:
+        engine: Engine do banco
+        table: Tabela do modelo (ex.: Event.__table__)
+
+    Returns:
+        Nomes dos índices criados
+    """
+    from core.database import missing_indexes
+
+    if engine.dialect.name != "postgresql":
+        pending = missing_indexes(table, bind=engine)
+        for index in pending:
+            index.create(bind=engine, checkfirst=True)
+        return [index.name for index in pending]
+
+    declared = {index.name: index for index in table.indexes}
+    created = []
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in _invalid_indexes(conn, table.name):
+            if name in declared:
+                logger.warning(f"Índice inválido {name} será recriado")
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+        for index in missing_indexes(table, bind=conn):
+            logger.info(f"Criando índice {index.name}")
+            conn.execute(text(create_index_sql(index)))
+            created.append(index.name)
+    return created
+
+
+def main(argv: Optional[list] = None) -> int:
+    setup_logging(service_name="encontros-tech")
+    from core.database import engine
+    from models.event import Event
+
+    created = create_indexes(engine, Event.__table__)
+    logger.info(f"Índices criados: {', '.join(created) if created else 'nenhum'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from models.event import Base
+import datetime
+
+class EventAudit(Base):
+    """Registro de eventos de negócio (EVENT_CREATED, WEB_EVENTS_PAGE_VIEWED, ...)"""
+    __tablename__ = 'event_audit'
+    id = Column(Integer, primary_key=True, index=True)
+    occurred_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+    event = Column(String(64), index=True, nullable=False)
+    source = Column(String(64))
+    host = Column(String(255))
+    details = Column(Text)
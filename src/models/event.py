@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
+from models.types import BinaryUUID
 import datetime
 import uuid
 
@@ -10,7 +11,8 @@ class Event(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(Text)
-    date = Column(DateTime, default=datetime.datetime.utcnow)
+    date = Column(DateTime, default=datetime.datetime.utcnow, index=True)
     location = Column(String)
-    edit_token = Column(String, unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    edit_token = Column(BinaryUUID, unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from models.event import Base
+
+class EventFacet(Base):
+    """Contagem pré-computada de eventos por local e por mês (YYYY-MM)"""
+    __tablename__ = 'event_facets'
+    __table_args__ = (UniqueConstraint('kind', 'value', name='uq_event_facets_kind_value'),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(16), nullable=False)
+    value = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
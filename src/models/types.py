@@ -0,0 +1,41 @@
+from sqlalchemy.types import TypeDecorator, LargeBinary
+from sqlalchemy.dialects import postgresql
+import uuid
+
+class BinaryUUID(TypeDecorator):
+    """
+    UUID armazenado em formato compacto: UUID nativo no PostgreSQL e BLOB de
+    16 bytes nos demais bancos. Na aplicação o valor continua sendo a string
+    canônica (36 caracteres) usada nas URLs.
+
+    Strings que não são UUIDs válidos viram NULL no bind, de forma que buscas
+    por tokens malformados simplesmente não encontram nenhuma linha.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    @staticmethod
+    def _to_uuid(value):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+            return uuid.UUID(bytes=bytes(value))
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return None
+
+    def process_bind_param(self, value, dialect):
+        value = self._to_uuid(value)
+        if value is None or dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        value = self._to_uuid(value)
+        return str(value) if value is not None else None
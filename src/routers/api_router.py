@@ -3,11 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
 
-from services import event_service
+from services import event_service, facet_service
 from services.event_service import EventNotFoundError
-from schemas.event import Event, EventCreate, EventUpdate
+from schemas.event import Event, EventCreate, EventUpdate, EventFilters
 from core.database import get_db
 from core.logging import get_logger, log_business_event
+from core.query_budget import PageSizeExceeded, StatementTimeoutExceeded, check_page_size, statement_timeout
+from core.settings import settings
 
 logger = get_logger("api_router")
 bp = Blueprint('api', __name__)
@@ -22,7 +24,7 @@ def create_event():
         
         event = EventCreate(**data)
         
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "api.create_event"):
             result = event_service.create_event(db=db, event=event)
             
             log_business_event(logger, "API_EVENT_CREATED", {
@@ -31,11 +33,13 @@ def create_event():
                 "method": "API"
             })
             
-            return jsonify(result.model_dump())
+            return jsonify(Event.model_validate(result).model_dump(mode="json"))
             
     except ValueError as e:
         logger.warning(f"Erro de validação na criação do evento: {str(e)}")
         abort(400, description=f"Dados inválidos: {str(e)}")
+    except StatementTimeoutExceeded as e:
+        abort(503, description=str(e), retry_after=settings.BUDGET_RETRY_AFTER)
     except Exception as e:
         logger.error(f"Erro interno na criação do evento: {str(e)}")
         abort(500, description="Erro interno do servidor")
@@ -47,31 +51,81 @@ def read_events():
     try:
         skip = request.args.get('skip', 0, type=int)
         limit = request.args.get('limit', 100, type=int)
-        search = request.args.get('search', None, type=str)
+        filters = EventFilters(
+            search=request.args.get('search', None, type=str),
+            date_from=request.args.get('from', None, type=str),
+            date_to=request.args.get('to', None, type=str),
+            upcoming=request.args.get('upcoming', 'false').lower() == 'true'
+        )
         
-        logger.debug(f"Parâmetros de busca: skip={skip}, limit={limit}, search={search}")
+        logger.debug(f"Parâmetros de busca: skip={skip}, limit={limit}, filtros={filters}")
+        check_page_size("api.read_events", skip, limit)
         
-        with get_db() as db:
-            events = event_service.get_events(db, skip=skip, limit=limit, search=search)
+        with get_db() as db, statement_timeout(db, "api.read_events"):
+            events = event_service.get_events(db, skip=skip, limit=limit, **filters.model_dump())
+            total = event_service.count_events(db, skip=skip, limit=limit, returned=len(events),
+                                               **filters.model_dump())
             
             log_business_event(logger, "API_EVENTS_LISTED", {
                 "count": len(events),
-                "has_search": search is not None,
+                "total": total.value,
+                "total_type": total.kind,
+                "has_search": filters.search is not None,
+                "has_date_filter": bool(filters.date_from or filters.date_to or filters.upcoming),
                 "method": "API"
             })
             
-            return jsonify([event.model_dump() for event in events])
+            response = jsonify([Event.model_validate(event).model_dump(mode="json") for event in events])
+            response.headers["X-Total-Count"] = str(total.value)
+            response.headers["X-Total-Count-Type"] = total.kind
+            return response
             
+    except PageSizeExceeded as e:
+        abort(422, description=str(e))
+    except ValueError as e:
+        logger.warning(f"Filtros inválidos na listagem: {str(e)}")
+        abort(400, description=f"Filtros inválidos: {str(e)}")
+    except StatementTimeoutExceeded as e:
+        abort(503, description=str(e), retry_after=settings.BUDGET_RETRY_AFTER)
     except Exception as e:
         logger.error(f"Erro ao listar eventos: {str(e)}")
         abort(500, description="Erro interno do servidor")
 
+@bp.route("/facets", methods=['GET'])
+def read_facets():
+    logger.info("API - Listando facetas de eventos")
+    
+    try:
+        locations_limit = request.args.get('locations_limit', None, type=int)
+        months_from = request.args.get('months_from', None, type=str)
+        if locations_limit is not None:
+            check_page_size("api.read_facets", 0, locations_limit)
+        
+        with get_db() as db, statement_timeout(db, "api.read_facets"):
+            facets = facet_service.get_facets(db, locations_limit=locations_limit, months_from=months_from)
+            
+            log_business_event(logger, "API_FACETS_LISTED", {
+                "locations": len(facets["locations"]),
+                "months": len(facets["months"]),
+                "method": "API"
+            })
+            
+            return jsonify(facets)
+            
+    except PageSizeExceeded as e:
+        abort(422, description=str(e))
+    except StatementTimeoutExceeded as e:
+        abort(503, description=str(e), retry_after=settings.BUDGET_RETRY_AFTER)
+    except Exception as e:
+        logger.error(f"Erro ao listar facetas: {str(e)}")
+        abort(500, description="Erro interno do servidor")
+
 @bp.route("/by-token/<edit_token>", methods=['GET'])
 def get_event_by_token(edit_token: str):
     logger.info(f"API - Buscando evento por token: {edit_token[:8]}...")
     
     try:
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "api.get_event_by_token"):
             result = event_service.get_event_by_token(db=db, edit_token=edit_token)
             
             log_business_event(logger, "API_EVENT_RETRIEVED_BY_TOKEN", {
@@ -80,11 +134,13 @@ def get_event_by_token(edit_token: str):
                 "method": "API"
             })
             
-            return jsonify(result.model_dump())
+            return jsonify(Event.model_validate(result).model_dump(mode="json"))
             
     except EventNotFoundError:
         logger.warning(f"Evento não encontrado para token: {edit_token[:8]}...")
         abort(404, description="Event not found")
+    except StatementTimeoutExceeded as e:
+        abort(503, description=str(e), retry_after=settings.BUDGET_RETRY_AFTER)
     except Exception as e:
         logger.error(f"Erro ao buscar evento por token: {str(e)}")
         abort(500, description="Erro interno do servidor")
@@ -99,7 +155,7 @@ def update_event(edit_token: str):
         
         event_update = EventUpdate(**data)
         
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "api.update_event"):
             result = event_service.update_event(db=db, edit_token=edit_token, event_update=event_update)
             
             log_business_event(logger, "API_EVENT_UPDATED", {
@@ -108,7 +164,7 @@ def update_event(edit_token: str):
                 "method": "API"
             })
             
-            return jsonify(result.model_dump())
+            return jsonify(Event.model_validate(result).model_dump(mode="json"))
             
     except EventNotFoundError:
         logger.warning(f"Evento não encontrado para atualização: {edit_token[:8]}...")
@@ -116,6 +172,8 @@ def update_event(edit_token: str):
     except ValueError as e:
         logger.warning(f"Erro de validação na atualização: {str(e)}")
         abort(400, description=f"Dados inválidos: {str(e)}")
+    except StatementTimeoutExceeded as e:
+        abort(503, description=str(e), retry_after=settings.BUDGET_RETRY_AFTER)
     except Exception as e:
         logger.error(f"Erro interno na atualização do evento: {str(e)}")
         abort(500, description="Erro interno do servidor")
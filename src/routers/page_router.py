@@ -1,43 +1,130 @@
-from flask import Blueprint, request, render_template, redirect, url_for, flash
+from flask import Blueprint, Response, request, render_template, redirect, url_for, flash
 from sqlalchemy.orm import Session
 from typing import Optional
 import datetime
 import socket
 
-from services import event_service
+from services import calendar_service, event_service, facet_service
 from services.event_service import EventNotFoundError
 from core.database import get_db
-from schemas.event import EventCreate, EventUpdate
+from schemas.event import EventCreate, EventUpdate, EventFilters
 from core.logging import get_logger, log_business_event
+from core.query_budget import StatementTimeoutExceeded, statement_timeout
+from core.settings import settings
 
 logger = get_logger("page_router")
 bp = Blueprint('pages', __name__)
 
+# Quantidade de locais exibidos nos contadores da página de listagem
+FACET_LOCATIONS_LIMIT = 8
+
+# Quantidade de eventos exibidos na página de listagem
+LIST_PAGE_SIZE = 100
+
 @bp.route("/")
 def list_events_page():
     logger.info("WEB - Acessando página de listagem de eventos")
     search = request.args.get('search', None)
+    upcoming = request.args.get('upcoming', 'false').lower() == 'true'
+    
+    try:
+        filters = EventFilters(
+            search=search,
+            date_from=request.args.get('from', None),
+            date_to=request.args.get('to', None),
+            upcoming=upcoming
+        )
+    except ValueError as e:
+        logger.warning(f"Filtros de data inválidos ignorados: {str(e)}")
+        filters = EventFilters(search=search, upcoming=upcoming)
     
     try:
-        with get_db() as db:
-            events = event_service.get_events(db, search=search)
+        with get_db() as db, statement_timeout(db, "pages.list_events_page"):
+            events = event_service.get_events(db, limit=LIST_PAGE_SIZE, **filters.model_dump())
+            total = event_service.count_events(db, limit=LIST_PAGE_SIZE, returned=len(events),
+                                               **filters.model_dump())
+            facets = facet_service.get_facets(
+                db,
+                locations_limit=FACET_LOCATIONS_LIMIT,
+                months_from=datetime.date.today().strftime("%Y-%m")
+            )
             
             log_business_event(logger, "WEB_EVENTS_PAGE_VIEWED", {
                 "count": len(events),
                 "has_search": search is not None,
+                "has_date_filter": bool(filters.date_from or filters.date_to or filters.upcoming),
                 "method": "WEB"
             })
             
             return render_template("events/list.html", 
                                  events=events,
+                                 facets=facets,
+                                 total=total,
                                  current_search=search,
+                                 filters=filters,
                                  server_name=socket.gethostname())
+    except StatementTimeoutExceeded:
+        return render_template("events/list.html",
+                             events=[],
+                             facets=None,
+                             current_search=search,
+                             filters=filters,
+                             budget_exceeded=True,
+                             server_name=socket.gethostname()), 503, {"Retry-After": str(settings.BUDGET_RETRY_AFTER)}
     except Exception as e:
         logger.error(f"Erro ao carregar página de eventos: {str(e)}")
         return render_template("error.html", 
                              error_message="Erro ao carregar eventos",
                              server_name=socket.gethostname()), 500
 
+@bp.route("/events.ics")
+def events_calendar():
+    search = request.args.get('search', '').strip() or None
+    location = request.args.get('location', '').strip() or None
+    base_url = request.url_root
+    
+    try:
+        with get_db() as db, statement_timeout(db, "pages.events_calendar"):
+            # Uma consulta basta para responder 304 aos clientes que já têm o feed atual
+            feed_version = facet_service.get_feed_version(db)
+            etag = calendar_service.feed_etag(feed_version, search, location, base_url)
+            if request.if_none_match.contains(etag):
+                _log_calendar_feed(search, location, count=None, not_modified=True)
+                return _not_modified(etag)
+            
+            # Sem Last-Modified: max(updated_at) dos eventos filtrados não muda quando
+            # um evento sai do filtro, então só o ETag (versão do feed) é confiável
+            listing = calendar_service.get_listing(db, feed_version, search=search, location=location)
+            blocks = calendar_service.get_blocks(db, listing, base_url)
+        
+        _log_calendar_feed(search, location, count=len(blocks), not_modified=False)
+        response = Response(calendar_service.iter_calendar(blocks), mimetype="text/calendar")
+        response.headers["Content-Disposition"] = 'inline; filename="encontros-tech.ics"'
+        response.headers["Cache-Control"] = f"public, max-age={settings.ICAL_MAX_AGE}"
+        response.set_etag(etag)
+        return response
+    except StatementTimeoutExceeded:
+        return Response("Servidor sobrecarregado, tente novamente em instantes", status=503,
+                        headers={"Retry-After": str(settings.BUDGET_RETRY_AFTER)}, mimetype="text/plain")
+    except Exception as e:
+        logger.error(f"Erro ao gerar feed iCalendar: {str(e)}")
+        return Response("Erro ao gerar calendário", status=500, mimetype="text/plain")
+
+def _log_calendar_feed(search: Optional[str], location: Optional[str], count: Optional[int], not_modified: bool):
+    log_business_event(logger, "WEB_CALENDAR_FEED_SERVED", {
+        "count": count,
+        "has_search": search is not None,
+        "has_location": location is not None,
+        "not_modified": not_modified,
+        "method": "WEB"
+    })
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.headers["Cache-Control"] = f"public, max-age={settings.ICAL_MAX_AGE}"
+    response.set_etag(etag)
+    return response
+
 @bp.route("/events/new")
 def new_event_page():
     return render_template("events/create.html", 
@@ -46,7 +133,7 @@ def new_event_page():
 @bp.route("/events/edit/<edit_token>")
 def edit_event_page(edit_token: str):
     try:
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "pages.edit_event_page"):
             event = event_service.get_event_by_token(db, edit_token)
             return render_template("events/edit.html",
                                  event=event,
@@ -55,12 +142,14 @@ def edit_event_page(edit_token: str):
     except EventNotFoundError:
         return render_template("events/not_found.html",
                              server_name=socket.gethostname())
+    except StatementTimeoutExceeded:
+        return _overloaded_page()
 
 
 @bp.route("/events/<int:event_id>")
 def event_detail_page(event_id: int):
     try:
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "pages.event_detail_page"):
             event = event_service.get_event(db, event_id=event_id)
             return render_template("events/detail.html",
                                  event=event,
@@ -68,6 +157,17 @@ def event_detail_page(event_id: int):
     except EventNotFoundError:
         return render_template("events/not_found.html",
                              server_name=socket.gethostname())
+    except StatementTimeoutExceeded:
+        return _overloaded_page()
+
+
+def _overloaded_page():
+    # Mesmo aviso da listagem quando o orçamento de consulta é excedido
+    return render_template("events/list.html",
+                         events=[],
+                         facets=None,
+                         budget_exceeded=True,
+                         server_name=socket.gethostname()), 503, {"Retry-After": str(settings.BUDGET_RETRY_AFTER)}
 
 
 # Endpoint para lidar com o formulário de criação de evento
@@ -90,7 +190,7 @@ def create_event_form():
         tech_list = [tech.strip() for tech in technologies.split(",") if tech.strip()]
         event = EventCreate(title=title, description=description, date=date, location=location, technologies=tech_list)
         
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "pages.create_event_form"):
             created_event = event_service.create_event(db=db, event=event)
             
             log_business_event(logger, "WEB_EVENT_CREATED", {
@@ -105,6 +205,9 @@ def create_event_form():
         logger.warning(f"Erro de validação no formulário: {str(e)}")
         flash(f"Erro nos dados do formulário: {str(e)}", "error")
         return redirect("/events/new")
+    except StatementTimeoutExceeded:
+        flash("Servidor sobrecarregado. Tente novamente em instantes.", "error")
+        return redirect("/events/new")
     except Exception as e:
         logger.error(f"Erro ao processar formulário de criação: {str(e)}")
         flash("Erro interno. Tente novamente.", "error")
@@ -131,7 +234,7 @@ def update_event_form(edit_token: str):
         tech_list = [tech.strip() for tech in technologies.split(",") if tech.strip()]
         event_update = EventUpdate(title=title, description=description, date=date, location=location, technologies=tech_list)
         
-        with get_db() as db:
+        with get_db() as db, statement_timeout(db, "pages.update_event_form"):
             updated_event = event_service.update_event(db=db, edit_token=edit_token, event_update=event_update)
             
             log_business_event(logger, "WEB_EVENT_UPDATED", {
@@ -150,6 +253,9 @@ def update_event_form(edit_token: str):
         logger.warning(f"Erro de validação na edição: {str(e)}")
         flash(f"Erro nos dados do formulário: {str(e)}", "error")
         return redirect(f"/events/edit/{edit_token}")
+    except StatementTimeoutExceeded:
+        flash("Servidor sobrecarregado. Tente novamente em instantes.", "error")
+        return redirect(f"/events/edit/{edit_token}")
     except Exception as e:
         logger.error(f"Erro ao processar formulário de edição: {str(e)}")
         flash("Erro interno. Tente novamente.", "error")
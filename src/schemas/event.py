@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
 import datetime
 
@@ -21,3 +21,30 @@ class Event(EventBase):
 
     class Config:
         from_attributes = True
+
+class EventFilters(BaseModel):
+    search: Optional[str] = None
+    date_from: Optional[datetime.datetime] = None
+    date_to: Optional[datetime.datetime] = None
+    upcoming: bool = False
+
+    @field_validator("search", "date_from", "date_to", mode="before")
+    @classmethod
+    def empty_as_none(cls, value):
+        return value or None
+
+    @field_validator("date_to", mode="before")
+    @classmethod
+    def date_to_end_of_day(cls, value):
+        # Uma data sem horário em "to" inclui o dia inteiro
+        if isinstance(value, str) and len(value) == 10:
+            return f"{value}T23:59:59.999999"
+        return value
+
+    @field_validator("date_from", "date_to")
+    @classmethod
+    def as_naive(cls, value):
+        # Event.date é gravado sem fuso (horário local): datas com fuso são convertidas
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
@@ -0,0 +1,200 @@
+from sqlalchemy.orm import Session
+from models.event import Event
+from services.event_service import _search_filter
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import datetime
+import hashlib
+import threading
+from core.logging import get_logger, log_database_operation
+from core.settings import settings
+
+logger = get_logger("calendar_service")
+
+CRLF = "\r\n"
+PRODID = "-//Encontros Tech//Eventos//PT-BR"
+CALENDAR_NAME = "Encontros Tech"
+
+# Eventos não têm horário de término; os clientes exibem este intervalo
+EVENT_DURATION = "PT2H"
+
+# RFC 5545: linhas com no máximo 75 octetos, continuadas com um espaço
+MAX_LINE_OCTETS = 75
+
+# Quantidade de ids por consulta ao buscar eventos sem bloco em cache
+FETCH_CHUNK = 500
+
+class _LRUCache:
+    """Cache LRU limitado e seguro entre threads (um por processo)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.items: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+# Blocos VEVENT por (id, updated_at, base_url): cada versão de evento é renderizada uma vez
+_blocks = _LRUCache(settings.ICAL_CACHE_SIZE)
+
+# Ids e versões dos eventos de cada feed, por (versão do feed, filtros)
+_listings = _LRUCache(64)
+
+class FeedListing(NamedTuple):
+    entries: List[Tuple[int, Optional[datetime.datetime]]]
+
+def escape_text(value: Optional[str]) -> str:
+    """Escapa um valor TEXT conforme a RFC 5545"""
+    if not value:
+        return ""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+def fold_line(line: str) -> str:
+    """Quebra a linha em no máximo 75 octetos sem dividir caracteres UTF-8"""
+    if len(line.encode("utf-8")) <= MAX_LINE_OCTETS:
+        return line + CRLF
+
+    parts, current, size = [], "", 0
+    for char in line:
+        octets = len(char.encode("utf-8"))
+        if size + octets > MAX_LINE_OCTETS:
+            parts.append(current)
+            current, size = char, 1 + octets  # o espaço da continuação também conta
+        else:
+            current += char
+            size += octets
+    parts.append(current)
+    return (CRLF + " ").join(parts) + CRLF
+
+def _utc_stamp(value: datetime.datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def render_vevent(event: Event, base_url: str) -> str:
+    """
+    Renderiza o bloco VEVENT de um evento
+
+    Args:
+        event: Evento do banco
+        base_url: URL raiz da aplicação (com barra final), usada no link do evento
+
+    Returns:
+        Bloco VEVENT com linhas terminadas em CRLF
+    """
+    url = f"{base_url}events/{event.id}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@encontros-tech",
+        f"DTSTAMP:{_utc_stamp(event.updated_at or event.date)}",
+        # Datas são gravadas sem fuso: horário "flutuante", exibido como cadastrado
+        f"DTSTART:{event.date.strftime('%Y%m%dT%H%M%S')}",
+        f"DURATION:{EVENT_DURATION}",
+        f"SUMMARY:{escape_text(event.title)}",
+        f"DESCRIPTION:{escape_text(event.description)}",
+        f"LOCATION:{escape_text(event.location)}",
+        f"URL:{url}",
+        "END:VEVENT",
+    ]
+    return "".join(fold_line(line) for line in lines)
+
+def feed_etag(feed_version: int, search: Optional[str], location: Optional[str], base_url: str) -> str:
+    """ETag do feed: muda a cada criação/edição de evento e é distinto por filtro"""
+    variant = hashlib.sha1(f"{search or ''}\n{location or ''}\n{base_url}".encode("utf-8")).hexdigest()[:12]
+    return f"ical-{feed_version}-{variant}"
+
+def get_listing(db: Session, feed_version: int, search: Optional[str] = None, location: Optional[str] = None) -> FeedListing:
+    """
+    Ids e versões (updated_at) dos eventos do feed, em cache por versão do feed
+
+    Args:
+        db: Sessão do banco
+        feed_version: Versão atual do feed (facet_service.get_feed_version)
+        search: Termo de busca em título, descrição e local
+        location: Trecho do local do evento
+
+    Returns:
+        FeedListing com os pares (id, updated_at) ordenados por data
+    """
+    key = (feed_version, search, location)
+    listing = _listings.get(key)
+    if listing is not None:
+        return listing
+
+    query = db.query(Event.id, Event.updated_at).filter(Event.date.isnot(None))
+    if search:
+        query = query.filter(_search_filter(search))
+    if location:
+        query = query.filter(Event.location.ilike(f"%{location}%"))
+    entries = [(event_id, updated_at) for event_id, updated_at in query.order_by(Event.date, Event.id)]
+
+    listing = FeedListing(entries=entries)
+    _listings.put(key, listing)
+    log_database_operation(logger, "READ", "events", f"ical_listing={len(entries)}")
+    return listing
+
+def get_blocks(db: Session, listing: FeedListing, base_url: str) -> List[str]:
+    """
+    Blocos VEVENT do feed; só os eventos sem bloco em cache são lidos do banco
+
+    Args:
+        db: Sessão do banco
+        listing: Resultado de get_listing
+        base_url: URL raiz da aplicação (com barra final)
+
+    Returns:
+        Blocos na ordem da listagem
+    """
+    blocks: Dict[int, str] = {}
+    missing = []
+    for event_id, updated_at in listing.entries:
+        block = _blocks.get((event_id, updated_at, base_url))
+        if block is None:
+            missing.append(event_id)
+        else:
+            blocks[event_id] = block
+
+    for start in range(0, len(missing), FETCH_CHUNK):
+        chunk = missing[start:start + FETCH_CHUNK]
+        for event in db.query(Event).filter(Event.id.in_(chunk)):
+            block = render_vevent(event, base_url)
+            _blocks.put((event.id, event.updated_at, base_url), block)
+            blocks[event.id] = block
+
+    if missing:
+        log_database_operation(logger, "READ", "events", f"ical_rendered={len(missing)}")
+    logger.debug(f"Feed iCalendar: {len(blocks) - len(missing)} bloco(s) do cache, {len(missing)} renderizado(s)")
+    return [blocks[event_id] for event_id, _ in listing.entries if event_id in blocks]
+
+def iter_calendar(blocks: Iterable[str]) -> Iterator[str]:
+    """Gera o VCALENDAR em partes, para envio em streaming"""
+    yield "".join(fold_line(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{CALENDAR_NAME}",
+    ))
+    yield from blocks
+    yield "END:VCALENDAR" + CRLF
@@ -1,15 +1,30 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from models.event import Event
 from schemas.event import EventCreate, EventUpdate
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
+import datetime
 from core.logging import get_logger, log_database_operation, log_business_event
+from core.settings import settings
+from services import facet_service
 
 logger = get_logger("event_service")
 
 class EventNotFoundError(Exception):
     pass
 
+class EventCount(NamedTuple):
+    """Total de eventos de uma listagem e como ele foi obtido"""
+    value: int
+    kind: str  # exact | estimated | capped (mais que value)
+
+def _search_filter(search: str):
+    return or_(
+        Event.title.ilike(f"%{search}%"),
+        Event.description.ilike(f"%{search}%"),
+        Event.location.ilike(f"%{search}%")
+    )
+
 def create_event(db: Session, event: EventCreate):
     logger.info(f"Criando novo evento: {event.title}")
     
@@ -21,6 +36,8 @@ def create_event(db: Session, event: EventCreate):
             location=event.location
         )
         db.add(db_event)
+        facet_service.apply_event_change(db, new_location=event.location, new_date=event.date, created=True)
+        facet_service.bump_feed_version(db)
         db.commit()
         db.refresh(db_event)
         
@@ -43,21 +60,45 @@ def create_event(db: Session, event: EventCreate):
         db.rollback()
         raise
 
-def get_events(db: Session, skip: int = 0, limit: int = 100, search: Optional[str] = None):
-    logger.debug(f"Buscando eventos: skip={skip}, limit={limit}, search={search}")
+def _date_filters(
+    date_from: Optional[datetime.datetime] = None,
+    date_to: Optional[datetime.datetime] = None,
+    upcoming: bool = False
+) -> list:
+    filters = []
+    if upcoming:
+        now = datetime.datetime.now()
+        date_from = max(date_from, now) if date_from else now
+    if date_from:
+        filters.append(Event.date >= date_from)
+    if date_to:
+        filters.append(Event.date <= date_to)
+    return filters
+
+def get_events(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
+    date_from: Optional[datetime.datetime] = None,
+    date_to: Optional[datetime.datetime] = None,
+    upcoming: bool = False
+):
+    logger.debug(f"Buscando eventos: skip={skip}, limit={limit}, search={search}, "
+                 f"date_from={date_from}, date_to={date_to}, upcoming={upcoming}")
     
     try:
         query = db.query(Event)
         
         if search:
-            search_filter = or_(
-                Event.title.ilike(f"%{search}%"),
-                Event.description.ilike(f"%{search}%"),
-                Event.location.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query = query.filter(_search_filter(search))
             logger.debug(f"Aplicando filtro de busca: {search}")
         
+        # Filtros de data e ordenação usam o índice em Event.date (range scan, sem sort)
+        date_filters = _date_filters(date_from, date_to, upcoming)
+        if date_filters:
+            query = query.filter(*date_filters)
+        
         query = query.order_by(Event.date)
         events = query.offset(skip).limit(limit).all()
         
@@ -70,6 +111,79 @@ def get_events(db: Session, skip: int = 0, limit: int = 100, search: Optional[st
         logger.error(f"Erro ao buscar eventos: {str(e)}")
         raise
 
+def _estimate_rows(db: Session, query) -> int:
+    """Estimativa de linhas do planejador do PostgreSQL para a consulta"""
+    compiled = query.statement.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def count_events(
+    db: Session,
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    returned: Optional[int] = None,
+    cap: Optional[int] = None,
+    date_from: Optional[datetime.datetime] = None,
+    date_to: Optional[datetime.datetime] = None,
+    upcoming: bool = False
+) -> EventCount:
+    """
+    Conta os eventos de uma listagem evitando uma segunda varredura completa
+
+    - Página incompleta: o total é deduzido de skip + eventos retornados
+    - Sem filtros: total exato mantido incrementalmente em event_facets
+    - Com filtros: estimativa do planejador (PostgreSQL) quando passa de cap,
+      senão contagem limitada a cap linhas
+
+    Args:
+        db: Sessão do banco
+        search: Termo de busca aplicado na listagem
+        skip: Deslocamento da página
+        limit: Tamanho da página solicitada
+        returned: Quantidade de eventos efetivamente retornados na página
+        cap: Máximo de linhas contadas em buscas filtradas
+        date_from: Data inicial aplicada na listagem
+        date_to: Data final aplicada na listagem
+        upcoming: Se a listagem considera apenas eventos futuros
+
+    Returns:
+        EventCount com o valor e o tipo da contagem
+    """
+    cap = settings.COUNT_CAP if cap is None else cap
+
+    try:
+        if returned is not None and limit and returned < limit and (returned > 0 or skip == 0):
+            return EventCount(skip + returned, "exact")
+
+        filters = _date_filters(date_from, date_to, upcoming)
+        if search:
+            filters.append(_search_filter(search))
+
+        if not filters:
+            total = facet_service.get_total(db)
+            if total is None:
+                total = db.query(func.count(Event.id)).scalar()
+            return EventCount(total, "exact")
+
+        query = db.query(Event.id).filter(*filters)
+
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = _estimate_rows(db, query)
+            if estimate > cap:
+                log_database_operation(logger, "COUNT", "events", f"estimated={estimate}")
+                return EventCount(estimate, "estimated")
+
+        counted = db.query(func.count()).select_from(query.limit(cap + 1).subquery()).scalar()
+        log_database_operation(logger, "COUNT", "events", f"capped_at={cap} counted={counted}")
+        if counted > cap:
+            return EventCount(cap, "capped")
+        return EventCount(counted, "exact")
+
+    except Exception as e:
+        logger.error(f"Erro ao contar eventos: {str(e)}")
+        raise
+
 def get_event_by_token(db: Session, edit_token: str):
     logger.debug(f"Buscando evento por token: {edit_token[:8]}...")
     
@@ -114,12 +228,20 @@ def update_event(db: Session, edit_token: str, event_update: EventUpdate):
     try:
         db_event = get_event_by_token(db, edit_token)
         old_title = db_event.title
+        old_location = db_event.location
+        old_date = db_event.date
         
         db_event.title = event_update.title
         db_event.description = event_update.description
         db_event.date = event_update.date
         db_event.location = event_update.location
         
+        facet_service.apply_event_change(
+            db,
+            old_location=old_location, old_date=old_date,
+            new_location=event_update.location, new_date=event_update.date
+        )
+        facet_service.bump_feed_version(db)
         db.commit()
         db.refresh(db_event)
         
@@ -0,0 +1,211 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, text, update
+from models.event import Event
+from models.facet import EventFacet
+from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter
+import datetime
+from core.logging import get_logger, log_database_operation
+
+logger = get_logger("facet_service")
+
+LOCATION = "location"
+MONTH = "month"
+TOTAL = "total"
+FEED = "feed"
+
+# Faceta única com o total de eventos (contagem exata da listagem sem filtros)
+TOTAL_KEY = (TOTAL, "all")
+
+# Contador incrementado a cada criação/edição de evento (versão do feed iCalendar)
+FEED_VERSION_KEY = (FEED, "version")
+
+FacetKey = Tuple[str, str]
+
+def facet_keys(location: Optional[str], date: Optional[datetime.datetime]) -> Set[FacetKey]:
+    keys = set()
+    if location:
+        keys.add((LOCATION, location))
+    if date:
+        keys.add((MONTH, date.strftime("%Y-%m")))
+    return keys
+
+def _bump(db: Session, key: FacetKey, delta: int):
+    kind, value = key
+    dialect = db.get_bind().dialect.name
+
+    # Upsert atômico evita corrida entre workers criando a mesma faceta
+    if delta > 0 and dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(EventFacet).values(kind=kind, value=value, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventFacet.kind, EventFacet.value],
+            set_={"count": EventFacet.count + delta},
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(
+        update(EventFacet)
+        .where(EventFacet.kind == kind, EventFacet.value == value)
+        .values(count=EventFacet.count + delta)
+    )
+    if result.rowcount == 0 and delta > 0:
+        db.execute(insert(EventFacet).values(kind=kind, value=value, count=delta))
+
+def apply_event_change(
+    db: Session,
+    old_location: Optional[str] = None,
+    old_date: Optional[datetime.datetime] = None,
+    new_location: Optional[str] = None,
+    new_date: Optional[datetime.datetime] = None,
+    created: bool = False,
+):
+    """
+    Atualiza as facetas incrementalmente, na transação corrente (sem commit)
+
+    Args:
+        db: Sessão do banco
+        old_location: Local antes da alteração (None na criação)
+        old_date: Data antes da alteração (None na criação)
+        new_location: Local após a alteração
+        new_date: Data após a alteração
+        created: Se o evento acabou de ser criado (incrementa o total)
+    """
+    old_keys = facet_keys(old_location, old_date)
+    new_keys = facet_keys(new_location, new_date)
+    if created:
+        new_keys.add(TOTAL_KEY)
+
+    for key in old_keys - new_keys:
+        _bump(db, key, -1)
+    for key in new_keys - old_keys:
+        _bump(db, key, 1)
+
+def bump_feed_version(db: Session):
+    """Invalida o feed iCalendar de todos os processos, na transação corrente (sem commit)"""
+    _bump(db, FEED_VERSION_KEY, 1)
+
+def get_feed_version(db: Session) -> int:
+    """Versão atual do feed iCalendar (0 se nenhum evento foi criado ou editado)"""
+    kind, value = FEED_VERSION_KEY
+    return db.query(EventFacet.count).filter(EventFacet.kind == kind, EventFacet.value == value).scalar() or 0
+
+def _lock_for_rebuild(db: Session):
+    """
+    Bloqueia escritas em events e event_facets até o fim da transação corrente
+
+    A ordem (facetas antes de eventos) é a mesma de create_event/update_event,
+    que atualizam as facetas antes de gravar o evento, evitando deadlock.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("LOCK TABLE event_facets IN SHARE ROW EXCLUSIVE MODE"))
+        db.execute(text("LOCK TABLE events IN SHARE MODE"))
+    elif dialect == "sqlite":
+        # Qualquer escrita (mesmo sem linhas afetadas) reserva o banco até o commit
+        db.execute(update(EventFacet).where(EventFacet.id == -1).values(count=EventFacet.count))
+
+def rebuild_facets(db: Session, only_if_missing: bool = False) -> Optional[Dict[str, int]]:
+    """
+    Recalcula todas as facetas a partir da tabela events
+
+    Leitura e regravação acontecem na mesma transação, com as escritas
+    bloqueadas, para que nenhuma criação/edição concorrente se perca.
+
+    Args:
+        db: Sessão do banco
+        only_if_missing: Só reconstrói se o total ainda não existir (verificado já com o lock)
+
+    Returns:
+        Quantidade de facetas gravadas por tipo; None se a reconstrução não foi necessária
+    """
+    try:
+        _lock_for_rebuild(db)
+        if only_if_missing and get_total(db) is not None:
+            db.rollback()
+            return None
+
+        logger.info("Reconstruindo facetas de eventos")
+        counts: Counter = Counter({TOTAL_KEY: 0})
+        # A versão do feed só avança: voltar a um valor antigo revalidaria ETags obsoletos
+        counts[FEED_VERSION_KEY] = get_feed_version(db) + 1
+        rows = db.query(Event.location, Event.date).execution_options(yield_per=1000)
+        for location, date in rows:
+            counts.update(facet_keys(location, date))
+            counts[TOTAL_KEY] += 1
+
+        db.execute(delete(EventFacet))
+        db.execute(insert(EventFacet), [
+            {"kind": kind, "value": value, "count": count}
+            for (kind, value), count in counts.items()
+        ])
+        db.commit()
+    except Exception as e:
+        logger.error(f"Erro ao reconstruir facetas: {str(e)}")
+        db.rollback()
+        raise
+
+    summary = {
+        LOCATION: sum(1 for kind, _ in counts if kind == LOCATION),
+        MONTH: sum(1 for kind, _ in counts if kind == MONTH),
+        TOTAL: counts[TOTAL_KEY],
+    }
+    log_database_operation(logger, "REBUILD", "event_facets",
+                           f"locations={summary[LOCATION]} months={summary[MONTH]} total={summary[TOTAL]}")
+    return summary
+
+def ensure_facets(db: Session):
+    """
+    Reconstrói as facetas quando o total ainda não foi calculado mas já existem eventos
+
+    Chamado por todos os workers na inicialização: a verificação é repetida sob
+    o lock, então só o primeiro reconstrói e os demais apenas leem o total.
+    """
+    if get_total(db) is None and db.query(Event.id).first() is not None:
+        db.rollback()  # encerra a transação de leitura antes de pedir o lock
+        rebuild_facets(db, only_if_missing=True)
+
+def get_total(db: Session) -> Optional[int]:
+    """Total de eventos mantido incrementalmente; None se ainda não foi calculado"""
+    kind, value = TOTAL_KEY
+    return db.query(EventFacet.count).filter(EventFacet.kind == kind, EventFacet.value == value).scalar()
+
+def get_facets(db: Session, locations_limit: Optional[int] = None, months_from: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """
+    Lê as contagens pré-computadas, sem consultar a tabela events
+
+    Args:
+        db: Sessão do banco
+        locations_limit: Máximo de locais retornados (os com mais eventos)
+        months_from: Mês inicial no formato YYYY-MM (inclusive)
+
+    Returns:
+        Dicionário com listas de {"value", "count"} para locations e months
+    """
+    locations = (
+        db.query(EventFacet.value, EventFacet.count)
+        .filter(EventFacet.kind == LOCATION, EventFacet.count > 0)
+        .order_by(EventFacet.count.desc(), EventFacet.value)
+    )
+    if locations_limit:
+        locations = locations.limit(locations_limit)
+
+    months = (
+        db.query(EventFacet.value, EventFacet.count)
+        .filter(EventFacet.kind == MONTH, EventFacet.count > 0)
+        .order_by(EventFacet.value)
+    )
+    if months_from:
+        months = months.filter(EventFacet.value >= months_from)
+
+    result = {
+        "locations": [{"value": value, "count": count} for value, count in locations.all()],
+        "months": [{"value": value, "count": count} for value, count in months.all()],
+    }
+    log_database_operation(logger, "READ", "event_facets",
+                           f"locations={len(result['locations'])} months={len(result['months'])}")
+    return result
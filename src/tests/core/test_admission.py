@@ -0,0 +1,173 @@
+from core.admission import AdmissionController, classify, WRITE, READ, LIST
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_classify():
+    assert classify("POST", "api.create_event") == WRITE
+    assert classify("POST", "pages.update_event_form") == WRITE
+    assert classify("GET", "api.read_events") == LIST
+    assert classify("GET", "pages.list_events_page") == LIST
+    assert classify("GET", "pages.events_calendar") == LIST
+    assert classify("GET", "pages.event_detail_page") == READ
+    assert classify("GET", "pages.new_event_page") is None
+    assert classify("GET", "static") is None
+    assert classify("GET", None) is None
+
+def test_rejects_when_limit_reached():
+    # Arrange
+    controller = AdmissionController(initial_limit=2, list_share=1.0)
+
+    # Act
+    admitted = [controller.try_acquire(READ) for _ in range(3)]
+
+    # Assert
+    assert admitted == [True, True, False]
+    assert controller.in_flight == 2
+
+def test_healthy_full_worker_does_not_shed_list_traffic():
+    # Arrange: limites padrão de um worker com 4 threads
+    controller = AdmissionController(initial_limit=4, max_limit=4, list_share=0.75)
+
+    # Act: todas as threads ocupadas com listagens rápidas
+    admitted = [controller.try_acquire(LIST) for _ in range(4)]
+    for _ in range(4):
+        controller.release(0.01)
+
+    # Assert
+    assert admitted == [True, True, True, True]
+    assert controller.limit == 4.0
+
+def test_writes_have_priority_over_list_traffic():
+    # Arrange: uma requisição lenta reduz o limite (banco sob pressão)
+    clock = FakeClock()
+    controller = AdmissionController(initial_limit=4, max_limit=4, list_share=0.5, target_latency=0.5, clock=clock)
+    clock.now = 10.0
+    controller.try_acquire(READ)
+    controller.release(1.0)
+    assert controller.limit < 4
+
+    # Act
+    list_admitted = [controller.try_acquire(LIST) for _ in range(3)]
+    write_admitted = [controller.try_acquire(WRITE) for _ in range(3)]
+
+    # Assert: listagens usam só metade do limite, escritas ocupam o restante
+    assert list_admitted == [True, True, False]
+    assert write_admitted == [True, True, False]
+
+def test_limit_decreases_when_latency_exceeds_target():
+    # Arrange
+    clock = FakeClock()
+    controller = AdmissionController(initial_limit=20, target_latency=0.5, clock=clock)
+
+    # Act
+    for _ in range(10):
+        clock.now += 5
+        controller.try_acquire(READ)
+        controller.release(latency=2.0)
+
+    # Assert
+    assert controller.limit < 20 * 0.9 ** 5
+
+def test_limit_decreases_once_per_rtt():
+    # Arrange
+    clock = FakeClock()
+    clock.now = 100
+    controller = AdmissionController(initial_limit=20, target_latency=0.5, clock=clock)
+
+    # Act: várias conclusões lentas no mesmo instante
+    for _ in range(10):
+        controller.try_acquire(READ)
+    for _ in range(10):
+        controller.release(latency=2.0)
+
+    # Assert
+    assert controller.limit == 18
+
+def test_limit_grows_when_healthy_and_used():
+    # Arrange
+    controller = AdmissionController(initial_limit=4, max_limit=5, target_latency=0.5)
+
+    # Act
+    for _ in range(100):
+        for _ in range(3):
+            controller.try_acquire(WRITE)
+        for _ in range(3):
+            controller.release(latency=0.01)
+
+    # Assert
+    assert controller.limit == 5
+
+def test_limit_respects_minimum_on_overload():
+    # Arrange
+    clock = FakeClock()
+    controller = AdmissionController(initial_limit=3, min_limit=2, clock=clock)
+
+    # Act
+    for _ in range(20):
+        clock.now += 10
+        controller.try_acquire(READ)
+        controller.release(latency=0.01, overloaded=True)
+
+    # Assert
+    assert controller.limit == 2
+
+def _app(controller):
+    from flask import Blueprint, Flask
+    from core import admission
+
+    app = Flask(__name__)
+    bp = Blueprint("api", __name__)
+
+    @bp.route("/")
+    def read_events():
+        return "ok"
+
+    @bp.route("/boom")
+    def get_event_by_token():
+        raise RuntimeError("falha")
+
+    app.register_blueprint(bp)
+    admission.init_app(app, admission=controller, retry_after=7)
+    return app
+
+def test_default_limits_follow_worker_threads(monkeypatch):
+    # Arrange
+    from core import admission
+    monkeypatch.setattr(admission.settings, "ADMISSION_INITIAL_LIMIT", 0)
+    monkeypatch.setattr(admission.settings, "ADMISSION_MAX_LIMIT", 0)
+    monkeypatch.setattr(admission.settings, "ADMISSION_MIN_LIMIT", 2)
+
+    # Act & Assert
+    assert admission.default_limits(4) == (4, 2, 4)
+    assert admission.default_limits(1) == (1, 1, 1)
+
+def test_init_app_sheds_with_retry_after():
+    # Arrange
+    controller = AdmissionController(initial_limit=1, list_share=1.0)
+    controller.in_flight = 1  # a única vaga já está ocupada
+    client = _app(controller).test_client()
+
+    # Act
+    response = client.get("/")
+
+    # Assert
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert controller.in_flight == 1
+
+def test_init_app_releases_slot_after_exception():
+    # Arrange
+    controller = AdmissionController(initial_limit=2, list_share=1.0)
+    client = _app(controller).test_client()
+
+    # Act
+    responses = [client.get("/boom").status_code, client.get("/").status_code]
+
+    # Assert
+    assert responses == [500, 200]
+    assert controller.in_flight == 0
@@ -0,0 +1,197 @@
+import datetime
+import json
+import multiprocessing
+import os
+import time
+from sqlalchemy import create_engine, func, select
+from core.audit import AuditSink, AUDIT_DROPPED
+from models.event import Base
+from models.audit import EventAudit
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(bind=engine, tables=[EventAudit.__table__])
+    return engine
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(EventAudit)).scalar()
+
+def test_flush_writes_batch(tmp_path):
+    # Arrange
+    engine = _engine(tmp_path)
+    sink = AuditSink(engine, batch_size=2, flush_interval=60)
+    sink._ensure_started = lambda: None  # sem thread: flush explícito
+
+    # Act
+    for i in range(5):
+        sink.record("EVENT_CREATED", "test", {"event_id": i})
+    written = sink.flush()
+
+    # Assert
+    assert written == 5
+    assert _count(engine) == 5
+    with engine.connect() as conn:
+        details = conn.execute(select(EventAudit.details).order_by(EventAudit.id)).scalars().first()
+    assert json.loads(details) == {"event_id": 0}
+
+def test_queue_full_spills_to_disk_and_replays(tmp_path):
+    # Arrange
+    engine = _engine(tmp_path)
+    spill_path = tmp_path / "spill.jsonl"
+    sink = AuditSink(engine, queue_size=2, spill_path=str(spill_path))
+    sink._ensure_started = lambda: None
+
+    # Act
+    for i in range(5):
+        sink.record("WEB_EVENTS_PAGE_VIEWED", "test", {"count": i})
+
+    # Assert: 2 na fila, 3 no arquivo de transbordo deste processo
+    own_spill = tmp_path / f"spill.jsonl.{os.getpid()}"
+    assert sink.queue.qsize() == 2
+    assert len(own_spill.read_text().splitlines()) == 3
+
+    assert sink.replay_spill() == 3
+    assert not own_spill.exists()
+    sink.flush()
+    assert _count(engine) == 5
+
+def test_queue_full_without_spill_drops(tmp_path):
+    # Arrange
+    sink = AuditSink(_engine(tmp_path), queue_size=1)
+    sink._ensure_started = lambda: None
+    before = AUDIT_DROPPED.labels(reason="queue_full")._value.get()
+
+    # Act
+    sink.record("A", "test", {})
+    sink.record("B", "test", {})
+
+    # Assert
+    assert AUDIT_DROPPED.labels(reason="queue_full")._value.get() == before + 1
+
+def test_database_error_spills_batch(tmp_path):
+    # Arrange: tabela event_audit não existe
+    engine = create_engine(f"sqlite:///{tmp_path / 'vazio.db'}")
+    spill_path = tmp_path / "spill.jsonl"
+    sink = AuditSink(engine, spill_path=str(spill_path))
+    sink._ensure_started = lambda: None
+
+    # Act
+    sink.record("EVENT_UPDATED", "test", {"event_id": 1})
+    sink.flush()
+
+    # Assert
+    assert json.loads((tmp_path / f"spill.jsonl.{os.getpid()}").read_text())["event"] == "EVENT_UPDATED"
+
+def test_close_flushes_pending_events(tmp_path):
+    # Arrange
+    engine = _engine(tmp_path)
+    sink = AuditSink(engine, flush_interval=0.05)
+
+    # Act
+    sink.record("EVENT_CREATED", "test", {"event_id": 1})
+    sink.close()
+
+    # Assert
+    assert _count(engine) == 1
+    assert not sink.thread.is_alive()
+
+def test_replay_quarantines_corrupt_lines(tmp_path):
+    # Arrange: linha truncada no meio do arquivo (worker morto durante a escrita)
+    engine = _engine(tmp_path)
+    spill_path = tmp_path / "spill.jsonl"
+    row = {"occurred_at": "2024-03-05T19:00:00", "event": "EVENT_CREATED", "source": "test", "host": "h", "details": "{}"}
+    (tmp_path / f"spill.jsonl.{os.getpid()}").write_text(
+        json.dumps(row) + "\n" + '{"occurred_at": "2024-03-05T1' + "\n" + json.dumps(row) + "\n"
+    )
+    sink = AuditSink(engine, spill_path=str(spill_path))
+    before = AUDIT_DROPPED.labels(reason="corrupt")._value.get()
+
+    # Act
+    written = sink.replay_spill()
+
+    # Assert
+    assert written == 2
+    assert _count(engine) == 2
+    assert AUDIT_DROPPED.labels(reason="corrupt")._value.get() == before + 1
+    assert (tmp_path / "spill.jsonl.bad").read_text().startswith('{"occurred_at": "2024-03-05T1')
+    assert list(tmp_path.glob("*.replay")) == []
+
+def test_replay_recovers_orphaned_replay_file(tmp_path, monkeypatch):
+    # Arrange: arquivo .replay de um processo que terminou no meio do reprocessamento
+    from core import audit
+
+    engine = _engine(tmp_path)
+    spill_path = tmp_path / "spill.jsonl"
+    row = {"occurred_at": "2024-03-05T19:00:00", "event": "EVENT_CREATED", "source": "test", "host": "h", "details": "{}"}
+    (tmp_path / "spill.jsonl.999999.replay").write_text(json.dumps(row) + "\n")
+    monkeypatch.setattr(audit, "_pid_alive", lambda pid: False)
+    sink = AuditSink(engine, spill_path=str(spill_path))
+
+    # Act
+    written = sink.replay_spill()
+
+    # Assert
+    assert written == 1
+    assert list(tmp_path.glob("*.replay")) == []
+
+def test_flusher_thread_survives_errors(tmp_path):
+    # Arrange
+    engine = _engine(tmp_path)
+    sink = AuditSink(engine, flush_interval=0.01)
+    calls = []
+
+    def failing_replay():
+        calls.append(1)
+        raise RuntimeError("falha inesperada")
+
+    sink.replay_spill = failing_replay
+
+    # Act
+    sink.record("EVENT_CREATED", "test", {"event_id": 1})
+    deadline = time.monotonic() + 5
+    while _count(engine) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Assert: a própria thread gravou o evento depois do erro
+    assert calls == [1]
+    assert _count(engine) == 1
+    assert sink.thread.is_alive()
+    sink.close()
+
+def _spill_from_child(engine_url, spill_path, rows, started):
+    sink = AuditSink(create_engine(engine_url), spill_path=spill_path)
+    row = {"occurred_at": "2024-03-05T19:00:00", "event": "EVENT_CREATED", "source": "filho", "host": "h", "details": "{}"}
+    started.set()
+    for _ in range(rows):
+        sink._spill([dict(row)], reason="queue_full")
+
+def test_replay_never_takes_a_file_another_process_is_writing(tmp_path):
+    # Arrange: outro processo transborda enquanto este reprocessa o próprio arquivo
+    engine = _engine(tmp_path)
+    spill_path = str(tmp_path / "spill.jsonl")
+    sink = AuditSink(engine, spill_path=spill_path)
+    sink._ensure_started = lambda: None
+    context = multiprocessing.get_context("fork")
+    started = context.Event()
+    child = context.Process(target=_spill_from_child, args=(str(engine.url), spill_path, 2000, started))
+
+    # Act
+    child.start()
+    started.wait(5)
+    written = 0
+    while child.is_alive():
+        sink._spill([{"occurred_at": datetime.datetime(2024, 3, 5), "event": "EVENT_UPDATED",
+                      "source": "pai", "host": "h", "details": "{}"}], reason="queue_full")
+        written += sink.replay_spill()
+    child.join()
+
+    # Assert: nada do filho foi reprocessado enquanto ele escrevia; depois de
+    # encerrado, seu arquivo é assumido e nenhuma linha se perde
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(EventAudit).where(EventAudit.source == "filho")).scalar() == 0
+    written += sink.replay_spill()
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(EventAudit).where(EventAudit.source == "filho")).scalar() == 2000
+    assert _count(engine) == written
+    assert [path.name for path in tmp_path.glob("spill.jsonl*")] == []
@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from core import query_budget
+from core.query_budget import PageSizeExceeded, StatementTimeoutExceeded, BUDGET_VIOLATIONS
+
+# Consulta propositalmente cara para estourar o timeout no SQLite
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+    "SELECT count(*) FROM c"
+)
+
+# Leva bem mais que 10ms, mas termina rápido sem timeout
+MEDIUM_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 2000000) "
+    "SELECT count(*) FROM c"
+)
+
+def _violations(endpoint, budget):
+    return BUDGET_VIOLATIONS.labels(endpoint=endpoint, budget=budget)._value.get()
+
+def test_parse_overrides():
+    # Act
+    overrides = query_budget.parse_overrides("api.read_events=2000, pages.list_events_page=3000,invalido,x=abc")
+
+    # Assert
+    assert overrides == {"api.read_events": 2000, "pages.list_events_page": 3000}
+
+def test_check_page_size_within_budget():
+    query_budget.check_page_size("test.within", skip=0, limit=query_budget.max_page_size("test.within"))
+
+@pytest.mark.parametrize("skip,limit", [(0, 10_000_000), (0, -1), (-1, 10), (10_000_000, 10)])
+def test_check_page_size_exceeded(skip, limit):
+    # Arrange
+    before = _violations("test.page", "page_size")
+
+    # Act & Assert
+    with pytest.raises(PageSizeExceeded):
+        query_budget.check_page_size("test.page", skip=skip, limit=limit)
+
+    assert _violations("test.page", "page_size") == before + 1
+
+def test_statement_timeout_interrupts_sqlite_query():
+    # Arrange
+    db = Session(create_engine("sqlite://"))
+    before = _violations("test.sqlite", "statement_timeout")
+
+    # Act & Assert
+    with pytest.raises(StatementTimeoutExceeded):
+        with query_budget.statement_timeout(db, "test.sqlite", timeout=10):
+            db.execute(SLOW_QUERY)
+
+    assert _violations("test.sqlite", "statement_timeout") == before + 1
+
+    # O progress handler é removido ao sair do contexto
+    assert db.execute(text("SELECT 1")).scalar() == 1
+
+def test_statement_timeout_applies_to_transactions_after_commit():
+    # Arrange
+    db = Session(create_engine("sqlite://"))
+
+    # Act & Assert: a transação aberta depois do commit também tem o timeout
+    with pytest.raises(StatementTimeoutExceeded):
+        with query_budget.statement_timeout(db, "test.commit", timeout=10):
+            db.execute(text("SELECT 1"))
+            db.commit()
+            db.execute(SLOW_QUERY)
+
+def test_statement_timeout_clears_handler_before_connection_returns_to_pool():
+    # Arrange
+    engine = create_engine("sqlite://")
+    db = Session(engine)
+
+    # Act
+    with query_budget.statement_timeout(db, "test.pool", timeout=10):
+        db.execute(text("SELECT 1"))
+        db.commit()
+
+        # Assert: outra sessão que reutiliza a conexão não herda o handler
+        other = Session(engine)
+        assert other.execute(MEDIUM_QUERY).scalar() == 2000000
+        other.close()
+
+def test_statement_timeout_sets_local_timeout_on_postgresql():
+    # Arrange
+    session = Session()
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+
+    # Act
+    with query_budget.statement_timeout(session, "test.pg", timeout=1500):
+        query_budget._on_begin(session, None, connection)
+
+    # Assert
+    statement, params = connection.execute.call_args[0]
+    assert "statement_timeout" in str(statement)
+    assert params == {"value": "1500ms"}
+
+def test_statement_timeout_keeps_other_errors():
+    # Arrange
+    db = Session(create_engine("sqlite://"))
+
+    # Act & Assert
+    with pytest.raises(Exception) as exc_info:
+        with query_budget.statement_timeout(db, "test.other", timeout=1000):
+            db.execute(text("SELECT * FROM tabela_inexistente"))
+
+    assert not isinstance(exc_info.value, StatementTimeoutExceeded)
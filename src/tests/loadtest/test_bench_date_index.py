@@ -0,0 +1,19 @@
+from sqlalchemy import create_engine, func, inspect, select
+from loadtest import bench_date_index
+from models.event import Base, Event
+
+def test_run_benchmark_leaves_app_tables_untouched():
+    # Arrange: banco com a tabela events da aplicação
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[Event.__table__])
+    indexes = {index["name"] for index in inspect(engine).get_indexes("events")}
+
+    # Act
+    results = bench_date_index.run_benchmark(engine, rows=500, limit=5, repeat=2)
+
+    # Assert
+    assert results["sem_indice"]["sort"] and not results["com_indice"]["sort"]
+    assert inspect(engine).get_table_names() == ["events"]
+    assert {index["name"] for index in inspect(engine).get_indexes("events")} == indexes
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Event.__table__)).scalar() == 0
@@ -0,0 +1,87 @@
+import pytest
+from loadtest.scenarios import Scenario, ScenarioPicker, parse_http_file
+from loadtest.runner import percentile, summarize, suggest_replicas
+
+HTTP_FILE = """### Base URL
+@baseUrl = http://localhost:8000
+@contentType = application/json
+
+### Criar evento
+POST {{baseUrl}}/api/events/
+Content-Type: {{contentType}}
+
+{
+  "title": "Workshop",
+  "location": "São Paulo, SP"
+}
+
+### Listar
+GET {{baseUrl}}/api/events/
+
+### Buscar por localização
+GET {{baseUrl}}/api/events/?search=São Paulo
+
+### Docs
+GET {{baseUrl}}/docs
+"""
+
+def test_parse_http_file():
+    # Act
+    scenarios = parse_http_file(HTTP_FILE)
+
+    # Assert
+    assert [s.method for s in scenarios] == ["POST", "GET", "GET", "GET"]
+    assert scenarios[0].url == "http://localhost:8000/api/events/"
+    assert scenarios[0].headers == {"Content-Type": "application/json"}
+    assert '"title": "Workshop"' in scenarios[0].body
+    assert scenarios[1].body is None
+    assert [s.category for s in scenarios] == ["write", "read", "search", "read"]
+
+def test_parse_http_file_with_base_url_override():
+    # Act
+    scenarios = parse_http_file(HTTP_FILE, overrides={"baseUrl": "http://127.0.0.1:9000"})
+
+    # Assert
+    assert scenarios[1].url == "http://127.0.0.1:9000/api/events/"
+
+def test_scenario_path_and_endpoint():
+    # Arrange
+    scenario = Scenario(name="busca", method="GET", url="http://x/api/events/?search=São Paulo&limit=5")
+
+    # Assert
+    assert scenario.path == "/api/events/?search=S%C3%A3o%20Paulo&limit=5"
+    assert scenario.endpoint == "GET /api/events/?limit&search"
+
+def test_scenario_picker_respects_mix():
+    # Arrange
+    scenarios = parse_http_file(HTTP_FILE)[:3]
+    picker = ScenarioPicker(scenarios, "write-heavy", seed=42)
+
+    # Act
+    picked = [picker.pick().category for _ in range(2000)]
+
+    # Assert
+    assert 0.55 < picked.count("write") / len(picked) < 0.65
+
+def test_scenario_picker_unknown_mix():
+    with pytest.raises(ValueError):
+        ScenarioPicker(parse_http_file(HTTP_FILE), "delete-heavy")
+
+def test_summarize_percentiles():
+    # Arrange
+    latencies = [i / 1000 for i in range(1, 101)]
+
+    # Act
+    summary = summarize(latencies, errors=5, elapsed=2.0)
+
+    # Assert
+    assert percentile(sorted(latencies), 95) == 0.095
+    assert summary["requests"] == 100
+    assert summary["error_rate"] == 0.05
+    assert summary["throughput_rps"] == 50.0
+    assert summary["latency_ms"]["p50"] == 50.0
+    assert summary["latency_ms"]["max"] == 100.0
+
+def test_suggest_replicas():
+    assert suggest_replicas(throughput_rps=100, target_rps=200) == 3
+    assert suggest_replicas(throughput_rps=0, target_rps=200) == 0
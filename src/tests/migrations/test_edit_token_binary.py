@@ -0,0 +1,64 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+from migrations import edit_token_binary
+from models.event import Event
+import uuid
+
+def _legacy_engine(rows: int):
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY, title VARCHAR, description TEXT, "
+            "date DATETIME, location VARCHAR, edit_token VARCHAR)"
+        ))
+        conn.execute(text("CREATE UNIQUE INDEX ix_events_edit_token ON events (edit_token)"))
+        conn.execute(
+            text("INSERT INTO events (id, title, location, edit_token) VALUES (:id, :title, 'SP', :token)"),
+            [{"id": i, "title": f"Evento {i}", "token": str(uuid.uuid4())} for i in range(1, rows + 1)]
+        )
+    return engine
+
+def test_migrate_keeps_string_tokens():
+    # Arrange
+    engine = _legacy_engine(rows=25)
+    with engine.connect() as conn:
+        tokens = dict(conn.execute(text("SELECT id, edit_token FROM events")).all())
+
+    # Act
+    migrated = edit_token_binary.migrate(engine, batch_size=10, drop_old=True)
+
+    # Assert
+    assert migrated is True
+    assert edit_token_binary.is_migrated(engine)
+    assert "edit_token_old" not in {c["name"] for c in inspect(engine).get_columns("events")}
+    with Session(engine) as db:
+        for event_id in (1, 13, 25):
+            found_id = db.query(Event.id).filter(Event.edit_token == tokens[event_id]).scalar()
+            assert found_id == event_id
+
+def test_migrate_is_idempotent():
+    # Arrange
+    engine = _legacy_engine(rows=3)
+    edit_token_binary.migrate(engine)
+
+    # Act & Assert
+    assert edit_token_binary.migrate(engine) is False
+
+def test_migrate_accepts_rows_written_by_new_code():
+    # Arrange: a versão nova grava 16 bytes na coluna de texto ainda não migrada
+    engine = _legacy_engine(rows=3)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE events ADD COLUMN updated_at DATETIME"))  # como ensure_columns
+    with Session(engine) as db:
+        created = Event(title="Novo", location="SP")
+        db.add(created)
+        db.commit()
+        token = str(created.edit_token)
+
+    # Act
+    migrated = edit_token_binary.migrate(engine)
+
+    # Assert
+    assert migrated is True
+    with Session(engine) as db:
+        assert db.query(Event.title).filter(Event.edit_token == token).scalar() == "Novo"
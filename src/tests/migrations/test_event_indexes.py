@@ -0,0 +1,30 @@
+from sqlalchemy import create_engine, inspect, text
+from migrations import event_indexes
+from models.event import Event
+
+def test_create_index_sql_is_concurrent():
+    # Arrange
+    index = next(index for index in Event.__table__.indexes if index.name == "ix_events_date")
+
+    # Act
+    sql = event_indexes.create_index_sql(index)
+
+    # Assert
+    assert sql == "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_date ON events (date)"
+
+def test_create_indexes_adds_missing_indexes():
+    # Arrange: tabela anterior ao índice em date
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY, title VARCHAR, description TEXT, "
+            "date DATETIME, location VARCHAR, edit_token BLOB, updated_at DATETIME)"
+        ))
+
+    # Act
+    created = event_indexes.create_indexes(engine, Event.__table__)
+
+    # Assert
+    assert "ix_events_date" in created
+    assert "ix_events_date" in {index["name"] for index in inspect(engine).get_indexes("events")}
+    assert event_indexes.create_indexes(engine, Event.__table__) == []
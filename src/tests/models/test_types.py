@@ -0,0 +1,69 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
+from models.event import Base, Event
+from models.types import BinaryUUID
+import uuid
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return Session(engine)
+
+def test_edit_token_stored_as_16_bytes_on_sqlite():
+    # Arrange
+    db = _session()
+    event = Event(title="Evento", location="SP")
+    db.add(event)
+    db.commit()
+
+    # Act
+    stored_type, stored_length = db.execute(
+        text("SELECT typeof(edit_token), length(edit_token) FROM events")
+    ).one()
+
+    # Assert
+    assert stored_type == "blob"
+    assert stored_length == 16
+    assert str(uuid.UUID(event.edit_token)) == event.edit_token
+
+def test_lookup_by_string_token():
+    # Arrange
+    db = _session()
+    event = Event(title="Evento", location="SP")
+    db.add(event)
+    db.commit()
+    token = event.edit_token
+    db.expunge_all()
+
+    # Act
+    found = db.query(Event).filter(Event.edit_token == token).first()
+
+    # Assert
+    assert found.id == event.id
+    assert found.edit_token == token
+
+def test_malformed_token_matches_nothing():
+    # Arrange
+    db = _session()
+    db.add(Event(title="Evento", location="SP"))
+    db.commit()
+
+    # Act
+    found = db.query(Event).filter(Event.edit_token == "invalid-token").first()
+
+    # Assert
+    assert found is None
+
+def test_postgresql_uses_native_uuid():
+    # Arrange
+    dialect = postgresql.dialect()
+    token = str(uuid.uuid4())
+
+    # Act
+    impl = BinaryUUID().load_dialect_impl(dialect)
+    bound = BinaryUUID().process_bind_param(token, dialect)
+
+    # Assert
+    assert isinstance(impl, postgresql.UUID)
+    assert bound == uuid.UUID(token)
@@ -0,0 +1,34 @@
+import pytest
+from schemas.event import EventFilters
+import datetime
+
+def test_event_filters_date_to_includes_whole_day():
+    # Act
+    filters = EventFilters(date_from="2030-01-01", date_to="2030-01-31")
+
+    # Assert
+    assert filters.date_from == datetime.datetime(2030, 1, 1)
+    assert filters.date_to == datetime.datetime(2030, 1, 31, 23, 59, 59, 999999)
+
+def test_event_filters_empty_values():
+    # Act
+    filters = EventFilters(search="", date_from="", date_to=None)
+
+    # Assert
+    assert filters.search is None
+    assert filters.date_from is None
+    assert filters.upcoming is False
+
+def test_event_filters_invalid_date():
+    with pytest.raises(ValueError):
+        EventFilters(date_to="amanhã")
+
+def test_event_filters_timezone_aware_dates_become_naive():
+    # Act
+    filters = EventFilters(date_from="2024-01-01T00:00:00Z", date_to="2024-01-31T12:00:00-03:00", upcoming=True)
+
+    # Assert
+    expected = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    assert filters.date_from == expected
+    assert filters.date_to.tzinfo is None
+    assert max(filters.date_from, datetime.datetime.now()) is not None
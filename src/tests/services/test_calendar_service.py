@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+from services import calendar_service
+from services.calendar_service import FeedListing
+import datetime
+
+def _event(event_id=1, title="Meetup", updated_at=datetime.datetime(2024, 3, 1, 12, 0)):
+    event = MagicMock()
+    event.id = event_id
+    event.title = title
+    event.description = "Linha 1\nLinha 2"
+    event.date = datetime.datetime(2024, 3, 5, 19, 0)
+    event.location = "São Paulo, SP"
+    event.updated_at = updated_at
+    return event
+
+def test_escape_text():
+    assert calendar_service.escape_text("a, b; c\\d\ne") == "a\\, b\\; c\\\\d\\ne"
+    assert calendar_service.escape_text(None) == ""
+
+def test_fold_line_respects_octets_and_utf8():
+    # Act
+    folded = calendar_service.fold_line("DESCRIPTION:" + "é" * 100)
+
+    # Assert
+    lines = folded.split("\r\n")[:-1]
+    assert len(lines) > 1
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert all(line.startswith(" ") for line in lines[1:])
+    assert "".join(line[1:] if i else line for i, line in enumerate(lines)) == "DESCRIPTION:" + "é" * 100
+
+def test_render_vevent():
+    # Act
+    block = calendar_service.render_vevent(_event(), "http://localhost/")
+
+    # Assert
+    assert block.startswith("BEGIN:VEVENT\r\nUID:event-1@encontros-tech\r\n")
+    assert "DTSTAMP:20240301T120000Z\r\n" in block
+    assert "DTSTART:20240305T190000\r\n" in block
+    assert "LOCATION:São Paulo\\, SP\r\n" in block
+    assert "URL:http://localhost/events/1\r\n" in block
+    assert block.endswith("END:VEVENT\r\n")
+
+def test_feed_etag_changes_with_version_and_filters():
+    etag = calendar_service.feed_etag(3, None, None, "http://localhost/")
+
+    assert etag == calendar_service.feed_etag(3, None, None, "http://localhost/")
+    assert etag != calendar_service.feed_etag(4, None, None, "http://localhost/")
+    assert etag != calendar_service.feed_etag(3, None, "Recife", "http://localhost/")
+
+def test_get_listing_is_cached_per_feed_version():
+    # Arrange
+    calendar_service._listings.clear()
+    mock_db = MagicMock()
+    query = mock_db.query.return_value.filter.return_value.filter.return_value
+    query.order_by.return_value = [(1, datetime.datetime(2024, 3, 1)), (2, None)]
+
+    # Act
+    first = calendar_service.get_listing(mock_db, 7, location="Recife")
+    second = calendar_service.get_listing(mock_db, 7, location="Recife")
+
+    # Assert
+    assert first is second
+    assert first.entries == [(1, datetime.datetime(2024, 3, 1)), (2, None)]
+    assert mock_db.query.call_count == 1
+
+def test_get_blocks_renders_only_new_versions():
+    # Arrange
+    calendar_service._blocks.clear()
+    old, new = _event(1), _event(2, title="Novo")
+    calendar_service._blocks.put((1, old.updated_at, "http://localhost/"), "BLOCO-1")
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value = [new]
+    listing = FeedListing(entries=[(1, old.updated_at), (2, new.updated_at)])
+
+    # Act
+    blocks = calendar_service.get_blocks(mock_db, listing, "http://localhost/")
+
+    # Assert
+    assert blocks[0] == "BLOCO-1"
+    assert "SUMMARY:Novo" in blocks[1]
+    assert mock_db.query.call_count == 1
+    assert calendar_service._blocks.get((2, new.updated_at, "http://localhost/")) == blocks[1]
+
+def test_iter_calendar_wraps_blocks():
+    # Act
+    body = "".join(calendar_service.iter_calendar(["BLOCO\r\n"]))
+
+    # Assert
+    assert body.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    assert body.endswith("BLOCO\r\nEND:VCALENDAR\r\n")
@@ -93,6 +93,37 @@ def test_get_events_with_search_filter():
     mock_query.filter.assert_called_once()
     mock_filter.order_by.assert_called_once()
 
+def test_get_events_with_date_filters():
+    # Arrange
+    mock_db = MagicMock()
+    mock_query = mock_db.query.return_value
+    mock_filter = mock_query.filter.return_value
+    
+    # Act
+    event_service.get_events(
+        db=mock_db,
+        date_from=datetime.datetime(2030, 1, 1),
+        date_to=datetime.datetime(2030, 1, 31),
+        limit=20
+    )
+    
+    # Assert: um único filter com os dois limites, seguido da ordenação por data
+    mock_query.filter.assert_called_once()
+    assert len(mock_query.filter.call_args[0]) == 2
+    mock_filter.order_by.assert_called_once()
+    mock_filter.order_by.return_value.offset.return_value.limit.assert_called_once_with(20)
+
+def test_date_filters_upcoming_keeps_later_date_from():
+    # Arrange
+    future = datetime.datetime.now() + datetime.timedelta(days=30)
+    
+    # Act
+    filters = event_service._date_filters(date_from=future, upcoming=True)
+    
+    # Assert
+    assert len(filters) == 1
+    assert filters[0].right.value == future
+
 def test_get_event_by_token_success():
     # Arrange
     mock_db = MagicMock()
@@ -154,3 +185,51 @@ def test_update_event():
     mock_db.refresh.assert_called_once_with(existing_event)
 
 # Teste get_technologies removido - funcionalidade não implementada
+
+def test_count_events_from_incomplete_page():
+    # Arrange
+    mock_db = MagicMock()
+
+    # Act
+    total = event_service.count_events(db=mock_db, search="Python", skip=20, limit=10, returned=3)
+
+    # Assert
+    assert total == (23, "exact")
+    mock_db.query.assert_not_called()
+
+def test_count_events_unfiltered_uses_cached_total(monkeypatch):
+    # Arrange
+    mock_db = MagicMock()
+    monkeypatch.setattr(event_service.facet_service, "get_total", lambda db: 1234)
+
+    # Act
+    total = event_service.count_events(db=mock_db, limit=10, returned=10)
+
+    # Assert
+    assert total == (1234, "exact")
+    mock_db.query.assert_not_called()
+
+def test_count_events_filtered_is_capped():
+    # Arrange
+    mock_db = MagicMock()
+    mock_db.get_bind.return_value.dialect.name = "sqlite"
+    mock_db.query.return_value.select_from.return_value.scalar.return_value = 11
+
+    # Act
+    total = event_service.count_events(db=mock_db, search="Python", limit=10, returned=10, cap=10)
+
+    # Assert
+    assert total == (10, "capped")
+
+def test_count_events_filtered_uses_planner_estimate_on_postgresql(monkeypatch):
+    # Arrange
+    mock_db = MagicMock()
+    mock_db.get_bind.return_value.dialect.name = "postgresql"
+    monkeypatch.setattr(event_service, "_estimate_rows", lambda db, query: 50000)
+
+    # Act
+    total = event_service.count_events(db=mock_db, search="Python", limit=10, returned=10, cap=1000)
+
+    # Assert
+    assert total == (50000, "estimated")
+
@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock
+from services import facet_service
+from models.event import Event
+from models.facet import EventFacet
+import datetime
+
+def test_facet_keys():
+    # Act
+    keys = facet_service.facet_keys("São Paulo, SP", datetime.datetime(2024, 3, 5, 19, 0))
+
+    # Assert
+    assert keys == {("location", "São Paulo, SP"), ("month", "2024-03")}
+    assert facet_service.facet_keys(None, None) == set()
+
+def test_apply_event_change_on_create(monkeypatch):
+    # Arrange
+    bumps = []
+    monkeypatch.setattr(facet_service, "_bump", lambda db, key, delta: bumps.append((key, delta)))
+
+    # Act
+    facet_service.apply_event_change(MagicMock(), new_location="SP", new_date=datetime.datetime(2024, 3, 5), created=True)
+
+    # Assert
+    assert sorted(bumps) == [(("location", "SP"), 1), (("month", "2024-03"), 1), (("total", "all"), 1)]
+
+def test_apply_event_change_moves_location_and_month(monkeypatch):
+    # Arrange
+    bumps = []
+    monkeypatch.setattr(facet_service, "_bump", lambda db, key, delta: bumps.append((key, delta)))
+
+    # Act
+    facet_service.apply_event_change(
+        MagicMock(),
+        old_location="SP", old_date=datetime.datetime(2024, 3, 5),
+        new_location="RJ", new_date=datetime.datetime(2024, 4, 1)
+    )
+
+    # Assert
+    assert sorted(bumps) == [
+        (("location", "RJ"), 1), (("location", "SP"), -1),
+        (("month", "2024-03"), -1), (("month", "2024-04"), 1),
+    ]
+
+def test_apply_event_change_same_keys_is_noop(monkeypatch):
+    # Arrange
+    bumps = []
+    monkeypatch.setattr(facet_service, "_bump", lambda db, key, delta: bumps.append((key, delta)))
+
+    # Act: mesma localização e mesmo mês, apenas o dia muda
+    facet_service.apply_event_change(
+        MagicMock(),
+        old_location="SP", old_date=datetime.datetime(2024, 3, 5),
+        new_location="SP", new_date=datetime.datetime(2024, 3, 20)
+    )
+
+    # Assert
+    assert bumps == []
+
+def test_apply_event_change_update_of_empty_event_keeps_total(monkeypatch):
+    # Arrange
+    bumps = []
+    monkeypatch.setattr(facet_service, "_bump", lambda db, key, delta: bumps.append((key, delta)))
+
+    # Act: evento antigo sem local nem data recebe os dois na edição
+    facet_service.apply_event_change(MagicMock(), new_location="SP", new_date=datetime.datetime(2024, 3, 5))
+
+    # Assert
+    assert sorted(bumps) == [(("location", "SP"), 1), (("month", "2024-03"), 1)]
+
+def test_bump_falls_back_to_update_then_insert():
+    # Arrange
+    mock_db = MagicMock()
+    mock_db.get_bind.return_value.dialect.name = "mysql"
+    mock_db.execute.return_value.rowcount = 0
+
+    # Act
+    facet_service._bump(mock_db, ("location", "SP"), 1)
+
+    # Assert: UPDATE sem linhas afetadas seguido de INSERT
+    assert mock_db.execute.call_count == 2
+
+def _sqlite_engine(tmp_path):
+    from sqlalchemy import create_engine
+    from models.event import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'facets.db'}", connect_args={"timeout": 0.1})
+    Base.metadata.create_all(bind=engine, tables=[Event.__table__, EventFacet.__table__])
+    return engine
+
+def test_rebuild_facets_blocks_concurrent_writes(tmp_path):
+    # Arrange
+    import pytest
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+
+    engine = _sqlite_engine(tmp_path)
+    with Session(engine) as rebuilding, Session(engine) as writer:
+        facet_service._lock_for_rebuild(rebuilding)
+
+        # Act & Assert: a escrita concorrente espera o fim da reconstrução
+        writer.add(Event(title="Concorrente", date=datetime.datetime(2024, 3, 5), location="SP"))
+        with pytest.raises(OperationalError, match="locked"):
+            writer.commit()
+        rebuilding.rollback()
+
+def test_ensure_facets_rebuilds_only_once(tmp_path):
+    # Arrange
+    from sqlalchemy.orm import Session
+
+    engine = _sqlite_engine(tmp_path)
+    with Session(engine) as db:
+        db.add(Event(title="Evento", date=datetime.datetime(2024, 3, 5), location="SP"))
+        db.commit()
+
+    # Act: o primeiro worker reconstrói; quem chega depois encontra o total sob o lock
+    with Session(engine) as db:
+        facet_service.ensure_facets(db)
+    with Session(engine) as db:
+        late = facet_service.rebuild_facets(db, only_if_missing=True)
+
+    # Assert
+    assert late is None
+    with Session(engine) as db:
+        assert facet_service.get_total(db) == 1
+        assert facet_service.get_feed_version(db) == 1